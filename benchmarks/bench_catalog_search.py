@@ -0,0 +1,63 @@
+"""Times ScriptCatalog queries on a synthetic catalog, no display or script folder needed.
+
+    python benchmarks/bench_catalog_search.py 50000
+"""
+import gc
+import os
+import random
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import script_runner  # noqa: E402
+
+WORDS = ["copy", "configuration", "docker", "initialize", "export", "wifi", "password", "deploy", "backup",
+         "restore", "database", "cleanup", "logs", "install", "update", "service", "restart", "build", "release"]
+
+QUERIES = ["d", "do", "doc", "dock", "docker", "project_42", "wifi-pass", "restart-service", "zzz-not-there", "restart-servce"]
+
+
+def make_names(count, sections=500):
+    rng = random.Random(42)
+    names = []
+    for index in range(count):
+        words = "-".join(rng.sample(WORDS, 3))
+        extension = ".lnk" if index % 10 == 0 else ".bat"
+        names.append(f"project_{index % sections}-{words}-{index}{extension}")
+    return names
+
+
+def time_query(catalog, query, repeat=50, **options):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        results = catalog.find(query, **options)
+    return (time.perf_counter() - start) * 1000 / repeat, len(results)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    names = make_names(count)
+
+    catalog = script_runner.ScriptCatalog()
+    start = time.perf_counter()
+    catalog.update("", names)
+    print(f"{'build index':<28} {(time.perf_counter() - start) * 1000:>10.1f} ms {count} scripts")
+    gc.collect()  # Keep the collection triggered by building the index out of the first query
+
+    for query in QUERIES:
+        # Only the first run is timed for prefixes typed one key at a time, later runs hit the refinement cache
+        elapsed_ms, matches = time_query(catalog, query, repeat=1)
+        print(f"{'find ' + repr(query):<28} {elapsed_ms:>10.3f} ms {matches:>7} matches")
+    for query in QUERIES[-2:]:
+        elapsed_ms, matches = time_query(catalog, query, repeat=5, fuzzy=True)
+        print(f"{'fuzzy ' + repr(query):<28} {elapsed_ms:>10.3f} ms {matches:>7} matches")
+
+    start = time.perf_counter()
+    results = catalog.search("docker", fuzzy=True, limit=10)
+    print(f"{'ranked search top 10':<28} {(time.perf_counter() - start) * 1000:>10.3f} ms {results[:2]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Compares the previous icon loading (Pillow open + resize on every refresh) with IconCache.
+
+Tk needs a display, so on a headless machine run it under a virtual one:
+
+    xvfb-run python benchmarks/bench_icon_startup.py
+"""
+import os
+import sys
+import time
+import tkinter as tk
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import script_runner  # noqa: E402
+
+ICON_NAMES = ["recycle-bin", "edit", "edit-text", "admin", "duplicate"]
+REFRESHES = 20
+
+
+def load_with_pillow(root, img_path):
+    # What refresh_ui used to do on every call, including every search keystroke
+    from PIL import Image, ImageTk
+    icons = [ImageTk.PhotoImage(Image.open(os.path.join(img_path, name + ".png")).resize((20, 20), Image.ADAPTIVE))
+             for name in ICON_NAMES]
+    root.iconphoto(True, ImageTk.PhotoImage(Image.open(os.path.join(img_path, "icon.png"))))
+    return icons
+
+
+def load_with_cache(root, cache):
+    icons = [cache.get(name, script_runner.ICON_SIZE) for name in ICON_NAMES]
+    root.iconphoto(True, cache.get("icon"))
+    return icons
+
+
+def timed(label, action):
+    start = time.perf_counter()
+    action()
+    print(f"{label:<40} {(time.perf_counter() - start) * 1000:>8.2f} ms")
+
+
+def main():
+    script_runner.import_tk()  # IconCache uses the module's tk, which the GUI imports on start
+    root = tk.Tk()
+    root.withdraw()
+    img_path = script_runner.get_resource_path("res/img")
+
+    # Importing Pillow is part of the old startup cost, IconCache never imports it for 20px icons
+    timed("before: import PIL", lambda: __import__("PIL.ImageTk"))
+    timed("before: startup icons", lambda: load_with_pillow(root, img_path))
+    timed(f"before: {REFRESHES} refreshes", lambda: [load_with_pillow(root, img_path) for _ in range(REFRESHES)])
+
+    cache = script_runner.IconCache(img_path)
+    timed("after: startup icons", lambda: load_with_cache(root, cache))
+    timed(f"after: {REFRESHES} refreshes", lambda: [load_with_cache(root, cache) for _ in range(REFRESHES)])
+    timed("after: first 40px HiDPI variant", lambda: cache.get("admin", 40))
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
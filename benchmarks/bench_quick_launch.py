@@ -0,0 +1,75 @@
+"""Times the Quick Launch path, from the Enter key to a running process.
+
+Operators run the same few scripts over and over, so the benchmark launches 10 of them
+repeatedly from a folder of many. Tk needs a display, on a headless machine run it under a
+virtual one:
+
+    xvfb-run python benchmarks/bench_quick_launch.py 5000 200
+"""
+import os
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import script_runner  # noqa: E402
+
+HOT_SCRIPTS = 10
+
+
+def make_script_folder(folder, count, sections=40):
+    # Python scripts run the same way on every platform
+    for index in range(count):
+        with open(os.path.join(folder, f"section_{index % sections:03d}-script-{index:05d}.py"), "w") as f:
+            f.write("pass\n")
+
+
+def percentile(samples, fraction):
+    samples = sorted(samples)
+    return samples[int(fraction * (len(samples) - 1))]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    launches = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    with tempfile.TemporaryDirectory() as work_dir:
+        scripts_folder = os.path.join(work_dir, "scripts")
+        os.mkdir(scripts_folder)
+        make_script_folder(scripts_folder, count)
+        with open(os.path.join(work_dir, "config.cfg"), "w") as f:
+            f.write(f"[Settings]\nbat_files_folder = {scripts_folder}\nextensions = .py\nmax_concurrent_runs = {launches}\n")
+        os.environ[script_runner.CONFIG_DIR_VARIABLE] = work_dir
+
+        app = script_runner.BatFileRunner()
+        app.root.withdraw()
+        while not app.catalog_loaded or app.render_after_id:
+            app.root.update()
+            time.sleep(0.001)
+        app.skip_validation = False
+
+        hot_scripts = [f"script-{index:05d}" for index in range(0, count, count // HOT_SCRIPTS)][:HOT_SCRIPTS]
+        for index in range(launches):
+            app.show_quick_launcher()
+            launcher = app.quick_launcher
+            # Typed faster than the debounce, so Enter still has to rank the final query
+            for char in hot_scripts[index % HOT_SCRIPTS]:
+                launcher.entry.insert(script_runner.tk.END, char)
+            launcher.launch()
+            app.root.update()
+
+        latencies = list(launcher.latencies)
+        print(f"{'launch p50 / p95':<28} {percentile(latencies, 0.5):>8.2f} / {percentile(latencies, 0.95):.2f} ms "
+              f"({len(latencies)} of {launches} measured, budget {script_runner.QUICK_LAUNCH_BUDGET_MS} ms)")
+        top = app.rank_scripts("")
+        print(f"{'most used first':<28} {', '.join(os.path.basename(name) for name in top[:3])}")
+
+        while app.engine.get_counts() != (0, 0):
+            app.root.update()
+            time.sleep(0.01)
+        app.on_close()
+
+
+if __name__ == "__main__":
+    main()
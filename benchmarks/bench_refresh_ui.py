@@ -0,0 +1,83 @@
+"""Counts the widgets created and the pooled rows recycled by refresh_ui, each search keystroke and scrolling.
+
+Tk needs a display, so on a headless machine run it under a virtual one:
+
+    xvfb-run python benchmarks/bench_refresh_ui.py 2000
+"""
+import os
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import script_runner  # noqa: E402
+
+
+def make_script_folder(folder, count, sections=40):
+    for index in range(count):
+        file_name = f"section_{index % sections:03d}-script-{index:05d}.bat"
+        with open(os.path.join(folder, file_name), "w") as f:
+            f.write("@echo off\necho hello\n")
+
+
+def measure(app, label, action):
+    app.widget_stats.clear()
+    start = time.perf_counter()
+    action()
+    app.root.update_idletasks()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"{label:<32} {elapsed_ms:>10.1f} ms {app.widget_stats['created']:>8} created {app.widget_stats['recycled']:>8} recycled")
+
+
+def type_keyword(app, keyword):
+    for char in keyword:
+        app.search_entry.insert(script_runner.tk.END, char)
+        # Skip the debounce delay, as if the user paused after every key
+        measure(app, f"keystroke '{app.search_entry.get()}'", lambda: (app.search_files(None), app.apply_search()))
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    with tempfile.TemporaryDirectory() as work_dir:
+        scripts_folder = os.path.join(work_dir, "scripts")
+        os.mkdir(scripts_folder)
+        make_script_folder(scripts_folder, count)
+        with open(os.path.join(work_dir, "config.cfg"), "w") as f:
+            f.write(f"[Settings]\nbat_files_folder = {scripts_folder}\nmax_sections_per_row = 4\n")
+        # Keep the benchmark's config.cfg, caches and history out of the user's config folder
+        os.environ[script_runner.CONFIG_DIR_VARIABLE] = work_dir
+
+        start = time.perf_counter()
+        app = script_runner.BatFileRunner()
+        app.root.withdraw()
+        window_ms = (time.perf_counter() - start) * 1000
+        # The scripts are listed on a background thread and the rows created over a few passes
+        while not app.catalog_loaded or app.render_after_id:
+            app.root.update()
+            time.sleep(0.001)
+        print(f"{'window shown':<32} {window_ms:>10.1f} ms")
+        print(f"{'startup':<32} {(time.perf_counter() - start) * 1000:>10.1f} ms {count} scripts, {len(app.script_rows) + len(app.free_rows)} pooled rows")
+
+        measure(app, "refresh (unchanged)", app.refresh_ui)
+        type_keyword(app, "script-0001")
+        measure(app, "clear search", app.clear_search)
+        measure(app, "scroll to bottom", lambda: app.scroll_canvas("moveto", 1.0))
+        measure(app, "scroll to middle", lambda: app.scroll_canvas("moveto", 0.5))
+        measure(app, "scroll 50 units", lambda: [app.scroll_canvas("scroll", 1, "units") for _ in range(50)])
+        measure(app, "scroll to top", lambda: app.scroll_canvas("moveto", 0.0))
+
+        new_file = os.path.join(scripts_folder, "section_000-added.bat")
+        open(new_file, "w").close()
+        measure(app, "refresh (1 added)", app.refresh_ui)
+        os.rename(new_file, os.path.join(scripts_folder, "section_001-renamed.bat"))
+        measure(app, "refresh (1 renamed)", app.refresh_ui)
+        os.remove(os.path.join(scripts_folder, "section_001-renamed.bat"))
+        measure(app, "refresh (1 removed)", app.refresh_ui)
+
+        app.root.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+"""Benchmark suite for the catalog, search, refresh and launch paths, with baseline comparison.
+
+Generates synthetic script folders (mixed .bat/.lnk, many sections) and times each path. The
+results are written as JSON. Given a baseline from an earlier run, every timing is compared to
+it and the exit code is 1 when one got slower than the tolerance allows:
+
+    python benchmarks/run_suite.py --sizes 1000,10000 --output results.json
+    python benchmarks/run_suite.py --baseline results.json --output new.json
+
+The refresh_ui timings need a display. Without one, that part runs under xvfb-run when it is
+installed and is skipped otherwise. The suite runs on Linux too, pywin32 and send2trash are
+only imported by code paths it does not take.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import script_runner  # noqa: E402
+
+WORDS = ["copy", "configuration", "docker", "initialize", "export", "wifi", "password", "deploy", "backup",
+         "restore", "database", "cleanup", "logs", "install", "update", "service", "restart", "build", "release"]
+SEARCH_QUERIES = {
+    "search_prefix": "project_4",
+    "search_word": "docker",
+    "search_substring": "ocker-back",
+    "search_fuzzy": "restart-servce",
+}
+SHORTCUT_SHARE = 10  # One script in ten is a shortcut
+PREVIEW_FILES = 200
+LAUNCH_RUNS = 20
+DEFAULT_TOLERANCE = 0.25
+NOISE_FLOOR_MS = 1.0  # Differences below this are never reported as regressions
+
+
+def make_shell_link(lnk_path, target):
+    # Smallest MS-SHLLINK file parse_shell_link resolves: header plus a LinkInfo with a local path
+    header = struct.pack("<I16sIIQQQIIIHHII", 0x4C, b"\x01\x14\x02\x00\x00\x00\x00\x00\xc0\x00\x00\x00\x00\x00\x00\x46",
+                         0x02, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0)
+    volume_id = struct.pack("<4I", 0x11, 3, 0, 0x10) + b"\0"
+    local_base_path = target.encode("mbcs" if sys.platform == "win32" else "utf-8") + b"\0"
+    info_header_size = 0x1C
+    volume_id_offset = info_header_size
+    local_base_path_offset = volume_id_offset + len(volume_id)
+    suffix_offset = local_base_path_offset + len(local_base_path)
+    link_info_size = suffix_offset + 1
+    link_info = struct.pack("<7I", link_info_size, info_header_size, 0x01, volume_id_offset, local_base_path_offset, 0, suffix_offset)
+    with open(lnk_path, "wb") as f:
+        f.write(header + link_info + volume_id + local_base_path + b"\0")
+
+
+def make_script_folder(folder, count, sections=500):
+    # Names like the repo's own scripts, "section-words-index", spread over many sections
+    rng = random.Random(42)
+    targets_folder = os.path.join(folder, "targets")
+    os.makedirs(targets_folder)
+    scripts_folder = os.path.join(folder, "scripts")
+    os.makedirs(scripts_folder)
+    for index in range(count):
+        name = f"project_{index % sections}-{'-'.join(rng.sample(WORDS, 3))}-{index}"
+        script_text = "@echo off\n" + "".join(f"echo step {step}\n" for step in range(30))
+        if index % SHORTCUT_SHARE == 0:
+            target = os.path.join(targets_folder, name + ".bat")
+            with open(target, "w") as f:
+                f.write(script_text)
+            make_shell_link(os.path.join(scripts_folder, name + ".lnk"), target)
+        else:
+            with open(os.path.join(scripts_folder, name + ".bat"), "w") as f:
+                f.write(script_text)
+    return scripts_folder
+
+
+def measure(action, repeat):
+    # Median wall time in milliseconds, the first call included
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        action()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def bench_catalog(scripts_folder, results):
+    root = script_runner.ScriptRoot(scripts_folder, main=True)
+    results["scan"] = measure(root.scan, 5)
+    names = sorted(root.scan())
+
+    def build_catalog():
+        catalog = script_runner.ScriptCatalog()
+        catalog.update(scripts_folder, names)
+        return catalog
+    results["catalog_build"] = measure(build_catalog, 3)
+    catalog = build_catalog()
+    results["section_grouping"] = measure(catalog.get_section_files, 10)
+
+    for metric, query in SEARCH_QUERIES.items():
+        def search(query=query):
+            catalog.last_query = None  # Every query as if typed from scratch
+            catalog.find(query, fuzzy=metric == "search_fuzzy")
+        results[metric] = measure(search, 20)
+
+    def ranked_search():
+        catalog.last_query = None
+        catalog.search("docker", fuzzy=True, limit=10)
+    results["search_ranked_top10"] = measure(ranked_search, 20)
+    return names
+
+
+def bench_previews(scripts_folder, names, results):
+    bat_paths = [os.path.join(scripts_folder, name) for name in names if name.endswith(".bat")][:PREVIEW_FILES]
+    lnk_paths = [os.path.join(scripts_folder, name) for name in names if name.endswith(".lnk")][:PREVIEW_FILES]
+
+    def read_cold():
+        preview_cache = script_runner.PreviewCache()
+        for path in bat_paths:
+            preview_cache.get(path)
+    results[f"preview_cold_{PREVIEW_FILES}"] = measure(read_cold, 3)
+
+    preview_cache = script_runner.PreviewCache()
+    for path in bat_paths:
+        preview_cache.get(path)
+    results[f"preview_warm_{PREVIEW_FILES}"] = measure(lambda: [preview_cache.get(path) for path in bat_paths], 5)
+
+    def resolve_shortcuts():
+        resolver = script_runner.ShortcutResolver()
+        for path in lnk_paths:
+            if resolver.resolve(path) is None:
+                raise RuntimeError(f"{path} did not resolve")
+    results[f"shortcut_resolve_{len(lnk_paths)}"] = measure(resolve_shortcuts, 3)
+
+
+def bench_launch(work_dir, results):
+    # From submit to a running process, and to the process having exited, for a script that does nothing
+    extension = ".bat" if sys.platform == "win32" else ".sh"
+    script_path = os.path.join(work_dir, "noop" + extension)
+    with open(script_path, "w") as f:
+        f.write("@echo off\n" if extension == ".bat" else "exit 0\n")
+    engine = script_runner.ExecutionEngine(max_concurrent=1)
+    started, finished = [], []
+    for _ in range(LAUNCH_RUNS):
+        start = time.perf_counter()
+        run = engine.submit(script_path)
+        started.append((time.perf_counter() - start) * 1000)
+        run.done.wait(10)
+        finished.append((time.perf_counter() - start) * 1000)
+        while not engine.events.empty():
+            engine.events.get_nowait()
+    results["launch_to_running"] = statistics.median(started)
+    results["launch_to_exited"] = statistics.median(finished)
+
+
+def bench_gui(scripts_folder, work_dir):
+    # Runs in its own process, possibly under xvfb-run, and prints its results as JSON
+    with open(os.path.join(work_dir, "config.cfg"), "w") as f:
+        f.write(f"[Settings]\nbat_files_folder = {scripts_folder}\nmax_sections_per_row = 4\n")
+    os.environ[script_runner.CONFIG_DIR_VARIABLE] = work_dir
+    results = {}
+
+    start = time.perf_counter()
+    app = script_runner.BatFileRunner()
+    while not app.catalog_loaded or app.render_after_id:
+        app.root.update()
+    app.root.update_idletasks()
+    results["gui_startup"] = (time.perf_counter() - start) * 1000
+
+    def idle(action):
+        def run():
+            action()
+            app.root.update_idletasks()
+        return run
+    results["refresh_ui"] = measure(idle(app.refresh_ui), 5)
+
+    def type_query():
+        for length in range(1, len("docker") + 1):
+            app.search_entry.delete(0, script_runner.tk.END)
+            app.search_entry.insert(0, "docker"[:length])
+            app.search_files(None)
+            app.apply_search()  # Skips the debounce delay
+            app.root.update_idletasks()
+        app.clear_search()
+    results["search_typing_6_keys"] = measure(type_query, 3)
+    results["scroll_through"] = measure(idle(lambda: [app.scroll_canvas("moveto", step / 10) for step in range(11)]), 3)
+    app.on_close()
+    print(json.dumps(results))
+
+
+def run_gui_phase(scripts_folder, work_dir):
+    command = [sys.executable, os.path.abspath(__file__), "--gui-phase", scripts_folder, work_dir]
+    if sys.platform.startswith("linux") and not os.environ.get("DISPLAY"):
+        if not shutil.which("xvfb-run"):
+            return None, "no display and xvfb-run is not installed"
+        command = ["xvfb-run", "-a"] + command
+    completed = subprocess.run(command, capture_output=True, text=True)
+    if completed.returncode != 0:
+        return None, completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else f"exit code {completed.returncode}"
+    return json.loads(completed.stdout.strip().splitlines()[-1]), None
+
+
+def compare(results, baseline, tolerance):
+    # Lower is better everywhere. Returns the regressed "size/metric" names.
+    regressions = []
+    print(f"\n{'size/metric':<40} {'baseline':>10} {'current':>10} {'change':>8}")
+    for size, metrics in results["results"].items():
+        for metric, current in metrics.items():
+            previous = baseline.get("results", {}).get(size, {}).get(metric)
+            if not isinstance(current, (int, float)) or not isinstance(previous, (int, float)):
+                continue
+            change = (current - previous) / previous if previous else 0.0
+            regressed = change > tolerance and current - previous > NOISE_FLOOR_MS
+            if regressed:
+                regressions.append(f"{size}/{metric}")
+            print(f"{size + '/' + metric:<40} {previous:>10.2f} {current:>10.2f} {change:>+7.0%}{'  REGRESSED' if regressed else ''}")
+    return regressions
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Benchmark the catalog, search, refresh and launch paths.")
+    parser.add_argument("--sizes", default="1000,10000,50000", help="comma separated script counts")
+    parser.add_argument("--output", default="benchmark_results.json", help="where to write the results")
+    parser.add_argument("--baseline", help="results of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed slowdown before a timing counts as regressed")
+    parser.add_argument("--skip-gui", action="store_true", help="do not time refresh_ui")
+    parser.add_argument("--gui-phase", nargs=2, metavar=("SCRIPTS_FOLDER", "WORK_DIR"), help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    if args.gui_phase:
+        bench_gui(*args.gui_phase)
+        return 0
+
+    results = {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": {},
+    }
+    for size in [int(size) for size in args.sizes.split(",")]:
+        size_results = results["results"][str(size)] = {}
+        with tempfile.TemporaryDirectory() as work_dir:
+            print(f"{size} scripts: generating", flush=True)
+            scripts_folder = make_script_folder(work_dir, size)
+            names = bench_catalog(scripts_folder, size_results)
+            bench_previews(scripts_folder, names, size_results)
+            bench_launch(work_dir, size_results)
+            if not args.skip_gui:
+                gui_results, skipped_reason = run_gui_phase(scripts_folder, work_dir)
+                if gui_results is None:
+                    size_results["gui_skipped"] = skipped_reason
+                else:
+                    size_results.update(gui_results)
+        for metric, value in size_results.items():
+            print(f"  {metric:<32} {value:>10.2f} ms" if isinstance(value, float) else f"  {metric:<32} {value}")
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} timings regressed by more than {args.tolerance:.0%}: {', '.join(regressions)}")
+            return 1
+        print("\nNo regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,39 +1,1656 @@
-import tkinter as tk
-from tkinter import messagebox, filedialog, simpledialog
+import time
+MODULE_IMPORT_STARTED_AT = time.perf_counter()
+
+import argparse
 import subprocess
 import os
 import sys
+import codecs
 import configparser
-import send2trash
+import io
+import json
+import locale
+import math
+import bisect
+import heapq
+import re
+import fnmatch
 import shutil
 import ctypes
-import win32com.client
+import queue
+import getpass
+import select
+import signal
+import struct
+import tempfile
+import threading
+from collections import Counter, OrderedDict, defaultdict, deque
 from datetime import datetime
 from functools import partial
-from PIL import Image, ImageTk
+
+MODULE_LOADED_AT = time.perf_counter()
+
+# Tk is only imported once the GUI starts, the headless modes never load it
+tk = messagebox = filedialog = simpledialog = None
+
+SCRIPT_EXTENSIONS = (".bat", ".lnk")  # Listed unless "extensions" in config.cfg says otherwise
+RUNNABLE_EXTENSIONS = (".bat", ".cmd", ".ps1", ".sh", ".py")
+SEARCH_DEBOUNCE_MS = 150
+WATCH_QUEUE_POLL_MS = 200
+ICON_SIZE = 20
+PREVIEW_LINES = 20
+PREVIEW_READ_LIMIT = 8 * 1024  # Characters read for a preview, however long the first lines are
+PREVIEW_CACHE_SIZE = 512
+CONFIG_FILE = "config.cfg"
+CONFIG_DIR_VARIABLE = "SCRIPT_RUNNER_CONFIG_DIR"  # Overrides the per-user folder, e.g. for a portable setup
+SCRIPT_METADATA_FILE = "scripts.json"
+SETTINGS_SAVE_DELAY = 0.5
+FRECENCY_HALF_LIFE = 3 * 86400  # A run counts half as much three days later
+QUICK_LAUNCH_RESULTS = 10
+QUICK_LAUNCH_BUDGET_MS = 50  # Key press to running process, slower launches are logged
+QUICK_LAUNCH_SAMPLES = 100
+SHORTCUT_CACHE_FILE = "shortcut_cache.json"
+CATALOG_SNAPSHOT_FILE = "catalog_snapshot.json"
+CATALOG_SNAPSHOT_VERSION = 1
+SECTION_HEADER_HEIGHT = 30
+SECTION_PADDING = 10
+ROW_PADDING = 4
+ROW_CREATE_BATCH = 25  # Pooled rows created per pass while the grid fills up
+CATALOG_POLL_MS = 20
+ROOT_SCAN_WORKERS = 8
+WATCH_POLL_INTERVAL = 3.0  # Seconds between folder checks when inotify is not available
+WATCH_FULL_SCAN_TICKS = 10  # Polls between listings of an unchanged folder, to notice edited scripts
+MAX_CONCURRENT_RUNS = 4
+OUTPUT_CHUNK_SIZE = 4096
+RUN_EVENTS_POLL_MS = 100
+RUN_EVENTS_BATCH = 500  # Events handled per tick, so a chatty script cannot freeze the UI
+LOG_MAX_LINES = 5000
+SECTION_MANIFEST_FILE = "sections.cfg"
+HISTORY_FILE = "run_history.db"
+HISTORY_RUNS_PER_SCRIPT = 1000
+HISTORY_MAX_AGE_DAYS = 90
+HISTORY_STATS_WINDOW = 200  # Recent runs per script used for the p50/p95 in tooltips
+HISTORY_BATCH_SIZE = 500
+HISTORY_FLUSH_DELAY = 1.0
+HISTORY_COMPACT_INTERVAL = 3600
+SPAN_BUFFER_SIZE = 10000  # Most recent timing spans kept for the Diagnostics window and the trace export
+SPAN_HISTOGRAM_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+DEPENDENCY_HEADER = re.compile(r"^\s*(?:@?rem|::|#)\s*(?:depends(?:-on)?|after)\s*:\s*(.+?)\s*$", re.IGNORECASE | re.MULTILINE)
+LOG_PANE_HEIGHT = 8  # Lines of script output visible in the log pane
+CONTENT_INDEX_LIMIT = 64 * 1024  # Only the head of each script is kept for content search
+
+
+def import_tk():
+    global tk, messagebox, filedialog, simpledialog
+    import tkinter as tk
+    from tkinter import messagebox, filedialog, simpledialog
+
+
+def get_resource_path(relative_path):
+    if hasattr(sys, '_MEIPASS'):
+        # Running as a bundled executable
+        return os.path.join(sys._MEIPASS, relative_path)
+    # Running as a regular Python script
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), relative_path)
+
+
+def get_app_folder():
+    # Folder of the executable or of this script, where config.cfg used to be looked up
+    if getattr(sys, 'frozen', False):
+        return os.path.dirname(sys.executable)
+    return os.path.dirname(os.path.abspath(__file__))
+
+
+def get_config_dir():
+    # Per-user folder holding config.cfg and the caches, so the working directory does not matter
+    folder = os.environ.get(CONFIG_DIR_VARIABLE)
+    if not folder:
+        if sys.platform == "win32":
+            folder = os.path.join(os.environ.get("APPDATA") or os.path.expanduser("~"), "ScriptRunner")
+        elif sys.platform == "darwin":
+            folder = os.path.expanduser("~/Library/Application Support/ScriptRunner")
+        else:
+            folder = os.path.join(os.environ.get("XDG_CONFIG_HOME") or os.path.expanduser("~/.config"), "script_runner")
+    os.makedirs(folder, exist_ok=True)
+    return folder
+
+
+def get_config_path(file_name):
+    return os.path.join(get_config_dir(), file_name)
+
+
+def write_file_atomic(path, text):
+    # Written next to the old file and swapped in, a crash never leaves half a file
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(temp_path, path)
+
+
+class Settings:
+    # config.cfg and the per-script metadata (favorites, run counts, ...) held in memory. A change
+    # only marks its file dirty, a writer thread saves it SETTINGS_SAVE_DELAY later, so a burst of
+    # changes is a single write that never blocks the Tk thread.
+    def __init__(self, folder, save_delay=SETTINGS_SAVE_DELAY):
+        self.config_path = os.path.join(folder, CONFIG_FILE)
+        self.scripts_path = os.path.join(folder, SCRIPT_METADATA_FILE)
+        self.save_delay = save_delay
+        self.config = configparser.ConfigParser()
+        self.scripts = {}  # script path -> {"favorite": True, "runs": 12, ...}
+        self.lock = threading.Lock()
+        self.dirty = set()  # Paths of the files waiting to be written
+        self.changed = threading.Event()
+        self.closing = threading.Event()
+        self.thread = None
+        self.load()
+
+    def load(self):
+        if os.path.exists(self.config_path):
+            self.config.read(self.config_path, encoding="utf-8")
+        else:
+            # First start with the per-user folder, carry over the config.cfg used until now
+            for legacy_path in (os.path.abspath(CONFIG_FILE), os.path.join(get_app_folder(), CONFIG_FILE)):
+                if self.config.read(legacy_path, encoding="utf-8"):
+                    self.dirty.add(self.config_path)
+                    break
+        if not self.config.has_section("Settings"):
+            self.config.add_section("Settings")
+        if not self.config.has_option("Settings", "bat_files_folder"):
+            self.config.set("Settings", "bat_files_folder", "")
+        try:
+            with open(self.scripts_path, "r", encoding="utf-8") as f:
+                self.scripts = json.load(f)
+        except (OSError, ValueError):
+            self.scripts = {}
+
+    def set(self, section, option, value):
+        with self.lock:
+            if not self.config.has_section(section):
+                self.config.add_section(section)
+            self.config.set(section, option, str(value))
+            self.mark_dirty(self.config_path)
+
+    def get_script_value(self, script, name, default=None):
+        with self.lock:
+            return self.scripts.get(script, {}).get(name, default)
+
+    def get_script_values(self, name):
+        # Script path -> value, for the scripts that have one
+        with self.lock:
+            return {script: values[name] for script, values in self.scripts.items() if name in values}
+
+    def set_script_value(self, script, name, value):
+        with self.lock:
+            self.scripts.setdefault(script, {})[name] = value
+            self.mark_dirty(self.scripts_path)
+
+    def increment_script_value(self, script, name):
+        with self.lock:
+            values = self.scripts.setdefault(script, {})
+            values[name] = values.get(name, 0) + 1
+            self.mark_dirty(self.scripts_path)
+            return values[name]
+
+    def rename_script(self, old_script, new_script):
+        with self.lock:
+            if old_script in self.scripts:
+                self.scripts[new_script] = self.scripts.pop(old_script)
+                self.mark_dirty(self.scripts_path)
+
+    def remove_script(self, script):
+        with self.lock:
+            if self.scripts.pop(script, None) is not None:
+                self.mark_dirty(self.scripts_path)
+
+    def mark_dirty(self, path):
+        # Called with the lock held
+        self.dirty.add(path)
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, name="SettingsWriter", daemon=True)
+            self.thread.start()
+        self.changed.set()
+
+    def run(self):
+        while not self.closing.is_set():
+            self.changed.wait()
+            # Changes made during the delay go into the same write
+            self.closing.wait(self.save_delay)
+            self.changed.clear()
+            self.save()
+
+    def save(self):
+        with self.lock:
+            files = {}
+            if self.config_path in self.dirty:
+                text = io.StringIO()
+                self.config.write(text)
+                files[self.config_path] = text.getvalue()
+            if self.scripts_path in self.dirty:
+                files[self.scripts_path] = json.dumps(self.scripts, separators=(",", ":"))
+            self.dirty.clear()
+        for path, text in files.items():
+            try:
+                write_file_atomic(path, text)
+            except OSError:
+                with self.lock:
+                    self.dirty.add(path)  # Retried with the next change or on close
+
+    def close(self):
+        # Writes whatever is still pending, on the caller's thread once the writer stopped
+        self.closing.set()
+        self.changed.set()
+        if self.thread:
+            self.thread.join(timeout=5)
+        self.save()
+
+
+def add_frecency(score, now):
+    # A score is log(sum(2 ** (t / half life))) over the run times t. Adding a run is O(1), and
+    # comparing two scores compares the decayed run counts at any moment, so nothing is ever
+    # recomputed as time passes. None is a script that never ran.
+    point = now * math.log(2) / FRECENCY_HALF_LIFE
+    if score is None:
+        return point
+    high, low = max(score, point), min(score, point)
+    return high + math.log1p(math.exp(low - high))
+
+
+def get_png_size(path):
+    # Width and height from the IHDR chunk, which always directly follows the PNG signature
+    with open(path, "rb") as f:
+        header = f.read(24)
+    return struct.unpack(">II", header[16:24])
+
+
+def get_section_name(file_name):
+    file_name = os.path.basename(file_name)
+    if '-' in file_name:
+        return file_name.split('-')[0]
+    return "#no_section"
+
+
+def group_sections(file_names, get_section=get_section_name):
+    # What ScriptCatalog.get_section_files returns for a sorted listing, without building the index
+    sections = {}
+    for file_name in file_names:
+        sections.setdefault(get_section(file_name), []).append(file_name)
+    return sections
+
+
+def parse_list_option(value):
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+class ScriptRoot:
+    # A folder the scripts are discovered in. Include and exclude globs match the path relative
+    # to the folder with "/" separators. Scripts of the main folder are keyed by that relative
+    # path and the ones of other roots by their full path, so joining any key to the main
+    # folder gives the script's path.
+    def __init__(self, path, extensions=SCRIPT_EXTENSIONS, include=(), exclude=(), recursive=False, subfolder_sections=False, main=False):
+        self.path = path
+        self.extensions = tuple(extensions)
+        self.include = list(include)
+        self.exclude = list(exclude)
+        self.recursive = recursive
+        self.subfolder_sections = subfolder_sections  # Scripts in a subfolder form a section named after it
+        self.main = main
+
+    @classmethod
+    def from_config(cls, config, section, path, main=False):
+        extensions = config.get("Settings", "extensions", fallback=", ".join(SCRIPT_EXTENSIONS))
+        return cls(path,
+                   extensions=parse_list_option(config.get(section, "extensions", fallback=extensions)),
+                   include=parse_list_option(config.get(section, "include", fallback="")),
+                   exclude=parse_list_option(config.get(section, "exclude", fallback="")),
+                   recursive=config.getboolean(section, "recursive", fallback=False),
+                   subfolder_sections=config.getboolean(section, "subfolder_sections", fallback=False),
+                   main=main)
+
+    def accepts(self, relative_path):
+        return relative_path.endswith(self.extensions) and self.matches_globs(relative_path)
+
+    def matches_globs(self, relative_path):
+        if not self.include and not self.exclude:
+            return True
+        relative_path = relative_path.replace(os.sep, "/")
+        if self.include and not any(fnmatch.fnmatch(relative_path, pattern) for pattern in self.include):
+            return False
+        return not self.is_excluded(relative_path)
+
+    def is_excluded(self, relative_path):
+        return any(fnmatch.fnmatch(relative_path.replace(os.sep, "/"), pattern) for pattern in self.exclude)
+
+    def get_key(self, relative_path):
+        return relative_path if self.main else os.path.join(self.path, relative_path)
+
+    def get_relative_path(self, key):
+        return key if self.main else os.path.relpath(key, self.path)
+
+    def get_section(self, relative_path):
+        folder = os.path.dirname(relative_path)
+        if self.subfolder_sections and folder:
+            return folder.replace(os.sep, "/")
+        return get_section_name(relative_path)
+
+    def contains(self, path):
+        return os.path.normcase(path).startswith(os.path.normcase(os.path.join(os.path.abspath(self.path), "")))
+
+    def scan(self, inodes=False):
+        # Key -> [mtime_ns, size], plus the inode for the watcher to recognize renames. On Windows
+        # the stat comes with the directory listing, so a network share costs one round trip per
+        # folder instead of one per file.
+        files = {}
+        folders = [""]
+        while folders:
+            relative_folder = folders.pop()
+            try:
+                entries = os.scandir(os.path.join(self.path, relative_folder))
+            except OSError:
+                if not relative_folder:
+                    raise
+                continue  # An unreadable subfolder should not hide the rest of the tree
+            prefix = relative_folder + os.sep if relative_folder else ""
+            with entries:
+                for entry in entries:
+                    relative_path = prefix + entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        if self.recursive and not self.is_excluded(relative_path):
+                            folders.append(relative_path)
+                    elif entry.name.endswith(self.extensions) and self.matches_globs(relative_path):
+                        try:
+                            stat = entry.stat()
+                        except OSError:
+                            continue  # Deleted or made unreadable since the listing
+                        state = [stat.st_mtime_ns, stat.st_size]
+                        if inodes:
+                            state.append(entry.inode())
+                        files[self.get_key(relative_path)] = state
+        return files
+
+
+class ScriptRoots:
+    # The main scripts folder of config.cfg plus the extra roots declared in "[Root <name>]"
+    # sections of it, each with its own path, globs and options
+    def __init__(self, roots):
+        self.roots = roots
+        self.main = roots[0]
+
+    @classmethod
+    def from_config(cls, config, folder):
+        roots = [ScriptRoot.from_config(config, "Settings", folder, main=True)]
+        for section in config.sections():
+            if section.startswith("Root ") and config.has_option(section, "path"):
+                # Keys of extra roots are absolute paths, which is how get_root tells them from the main folder
+                roots.append(ScriptRoot.from_config(config, section, os.path.abspath(config.get(section, "path"))))
+        return cls(roots)
+
+    def get_root(self, key):
+        if not os.path.isabs(key):
+            return self.main
+        # The most specific root, in case one root sits inside another
+        return max((root for root in self.roots[1:] if root.contains(key)), key=lambda root: len(root.path), default=self.main)
+
+    def get_section(self, key):
+        root = self.get_root(key)
+        return root.get_section(root.get_relative_path(key))
+
+    def accepts(self, key):
+        # Whether scanning would list the script, for changes made in the app
+        root = self.get_root(key)
+        return root.accepts(root.get_relative_path(key))
+
+    def get_key(self, path):
+        # Key of a script given its full path
+        path = os.path.abspath(path)
+        if self.main.contains(path):
+            return os.path.relpath(path, self.main.path)
+        return path
+
+    def scan(self):
+        # Roots are usually separate shares, so they are listed at the same time. A root that
+        # cannot be listed is skipped, except the main folder whose error is raised.
+        if len(self.roots) == 1:
+            return self.main.scan()
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=min(len(self.roots), ROOT_SCAN_WORKERS), thread_name_prefix="RootScan") as pool:
+            futures = [pool.submit(root.scan) for root in self.roots]
+        files = {}
+        for root, future in zip(self.roots, futures):
+            try:
+                files.update(future.result())
+            except OSError:
+                if root.main:
+                    raise
+        return files
+
+
+class ScriptCatalog:
+    # Tk independent index of a script folder. Names are lowercased once and indexed by trigram,
+    # so a search only verifies the few names that share every trigram with the query.
+    def __init__(self, get_section=get_section_name):
+        self.folder = None
+        self.get_section = get_section  # Section of a script key
+        self.names = {}  # script key -> lowercase file name
+        self.sections = {}  # section name -> sorted file names
+        self.trigrams = defaultdict(set)  # trigram -> set of file names containing it
+        self.contents = {}  # file name -> lowercase script head, only filled while content search is on
+        self.index_contents = False
+        self.stale_contents = set()  # Added or modified file names whose head is still to be read
+        self.last_query = None  # Typing extends the previous query, so its matches narrow down the next search
+        self.last_matches = set()
+
+    @staticmethod
+    def get_trigrams(text):
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+    def update(self, folder, file_names):
+        if folder != self.folder:
+            self.clear()
+            self.folder = folder
+        current_files = set(file_names)
+        for file_name in [file_name for file_name in self.names if file_name not in current_files]:
+            self.remove(file_name)
+        for file_name in file_names:
+            if file_name not in self.names:
+                self.add(file_name)
+
+    def clear(self):
+        self.names = {}
+        self.sections = {}
+        self.trigrams = defaultdict(set)
+        self.contents = {}
+        self.stale_contents = set()
+        self.last_query = None
+        self.last_matches = set()
+
+    def add(self, file_name):
+        self.last_query = None
+        lower_name = os.path.basename(file_name).lower()
+        self.names[file_name] = lower_name
+        trigrams = self.trigrams
+        for trigram in self.get_trigrams(lower_name):
+            trigrams[trigram].add(file_name)
+        bisect.insort(self.sections.setdefault(self.get_section(file_name), []), file_name)
+        if self.index_contents:
+            self.stale_contents.add(file_name)
+
+    def remove(self, file_name):
+        self.last_query = None
+        lower_name = self.names.pop(file_name)
+        for trigram in self.get_trigrams(lower_name):
+            postings = self.trigrams[trigram]
+            postings.discard(file_name)
+            if not postings:
+                del self.trigrams[trigram]
+        section_name = self.get_section(file_name)
+        files = self.sections[section_name]
+        files.pop(bisect.bisect_left(files, file_name))
+        if not files:
+            del self.sections[section_name]
+        self.contents.pop(file_name, None)
+        self.stale_contents.discard(file_name)
+
+    def set_index_contents(self, enabled):
+        # Only marks the scripts to read, the files are read by index_stale_contents or by the
+        # caller through take_stale_contents and set_contents, e.g. on another thread
+        self.index_contents = enabled
+        self.contents = {}
+        self.stale_contents = set(self.names) if enabled else set()
+
+    def mark_modified(self, file_name):
+        if self.index_contents and file_name in self.names:
+            self.stale_contents.add(file_name)
+
+    def take_stale_contents(self):
+        file_names, self.stale_contents = self.stale_contents, set()
+        return file_names
+
+    def set_contents(self, contents):
+        # Heads read since take_stale_contents, the ones of scripts removed meanwhile are dropped
+        if self.index_contents:
+            self.contents.update((file_name, text) for file_name, text in contents.items() if file_name in self.names)
+
+    def index_stale_contents(self):
+        self.set_contents({file_name: self.read_contents(file_name) for file_name in self.take_stale_contents()})
+
+    def read_contents(self, file_name):
+        if not file_name.endswith(RUNNABLE_EXTENSIONS):
+            return ""
+        try:
+            with open(os.path.join(self.folder, file_name), "r", encoding="utf-8", errors="replace") as f:
+                return f.read(CONTENT_INDEX_LIMIT).lower()
+        except OSError:
+            return ""
+
+    def get_section_files(self):
+        # Sections ordered by their first script, which is the order a sorted listing produces
+        return dict(sorted(self.sections.items(), key=lambda item: item[1][0]))
+
+    def find(self, query, search_contents=False, fuzzy=False):
+        query = query.lower()
+        if not query:
+            return set(self.names)
+        matches = self.find_names(query)
+        if search_contents:
+            matches.update(file_name for file_name, contents in self.contents.items() if query in contents)
+        if fuzzy:
+            matches.update(self.find_similar(query))
+        return matches
+
+    def find_names(self, query):
+        if self.last_query is not None and self.last_query in query:
+            candidates = self.last_matches
+        elif len(query) < 3:
+            candidates = self.names
+        else:
+            postings = sorted((self.trigrams.get(trigram, set()) for trigram in self.get_trigrams(query)), key=len)
+            candidates = postings[0].intersection(*postings[1:])
+        # Sharing every trigram does not guarantee they appear contiguously, so verify each candidate
+        names = self.names
+        matches = {file_name for file_name in candidates if query in names[file_name]}
+        self.last_query = query
+        self.last_matches = matches
+        return set(matches)
+
+    def find_similar(self, query, threshold=0.5):
+        # Trigram similarity, tolerant to typos and swapped words; returns file name -> similarity
+        query_trigrams = self.get_trigrams(query)
+        if not query_trigrams:
+            return {}
+        counts = Counter()
+        for trigram in query_trigrams:
+            counts.update(self.trigrams.get(trigram, ()))
+        return {file_name: count / len(query_trigrams) for file_name, count in counts.items() if count / len(query_trigrams) >= threshold}
+
+    def search(self, query, search_contents=False, fuzzy=False, limit=None, scores=None):
+        # Ranked results: name prefix, word prefix, substring, content match, then similar names.
+        # With scores (file name -> frecency), the most used name matches come first.
+        query = query.lower()
+        if not query:
+            return sorted(self.names)[:limit] if limit is None else heapq.nsmallest(limit, self.names)
+        ranked = {}
+        for file_name in self.find_names(query):
+            position = self.names[file_name].find(query)
+            if position == 0:
+                rank = 0
+            elif self.names[file_name][position - 1] in "-_ .":
+                rank = 1
+            else:
+                rank = 2
+            ranked[file_name] = (rank, 0.0)
+        # Content and similar matches rank after every name match, only look for them if they can
+        # still make the limit
+        enough = limit is not None and len(ranked) >= limit
+        if search_contents and not enough:
+            for file_name, contents in self.contents.items():
+                if file_name not in ranked and query in contents:
+                    ranked[file_name] = (3, 0.0)
+        if fuzzy and not enough:
+            for file_name, similarity in self.find_similar(query).items():
+                if file_name not in ranked:
+                    ranked[file_name] = (4, -similarity)
+        if scores:
+            def sort_key(file_name):
+                return ranked[file_name][0] >= 3, -scores.get(file_name, -math.inf), ranked[file_name], file_name
+        else:
+            def sort_key(file_name):
+                return ranked[file_name], file_name
+        if limit is None:
+            return sorted(ranked, key=sort_key)
+        return heapq.nsmallest(limit, ranked, key=sort_key)
+
+
+class IconCache:
+    # Loads every icon once per process and keeps one PhotoImage per (name, size). The shipped
+    # PNGs are already rendered at ICON_SIZE and are loaded by Tk directly, Pillow is only
+    # imported to resample them for other sizes, e.g. on HiDPI screens.
+    def __init__(self, img_path):
+        self.img_path = img_path
+        self.images = {}
+
+    def get(self, name, size=None):
+        key = (name, size)
+        if key not in self.images:
+            self.images[key] = self.load(name, size)
+        return self.images[key]
+
+    def load(self, name, size):
+        path = os.path.join(self.img_path, name + ".png")
+        if size is None or get_png_size(path) == (size, size):
+            return tk.PhotoImage(file=path)
+        from PIL import Image, ImageTk
+        return ImageTk.PhotoImage(Image.open(path).resize((size, size), Image.LANCZOS))
+
+
+def decode_ansi(data):
+    try:
+        return data.decode("mbcs")  # The active code page, only available on Windows
+    except LookupError:
+        return data.decode("cp1252", errors="replace")
+
+
+def read_c_string(data, offset, unicode=False):
+    if unicode:
+        end = offset
+        while data[end:end + 2] not in (b"\0\0", b""):
+            end += 2
+        return data[offset:end].decode("utf-16-le")
+    end = data.index(b"\0", offset)
+    return decode_ansi(data[offset:end])
+
+
+def parse_shell_link(lnk_path):
+    # Target path of a .lnk file, read from the Shell Link binary format (MS-SHLLINK).
+    # Returns None for shortcuts that only describe their target as a shell item ID list,
+    # e.g. shortcuts to virtual folders, those need the shell to resolve.
+    with open(lnk_path, "rb") as f:
+        data = f.read()
+    if len(data) < 0x4C or struct.unpack_from("<I", data, 0)[0] != 0x4C:
+        raise ValueError("Not a shell link file")
+    link_flags = struct.unpack_from("<I", data, 0x14)[0]
+    is_unicode = bool(link_flags & 0x80)
+    offset = 0x4C
+
+    if link_flags & 0x01:  # HasLinkTargetIDList
+        offset += 2 + struct.unpack_from("<H", data, offset)[0]
+
+    target = None
+    if link_flags & 0x02:  # HasLinkInfo
+        target = parse_link_info(data, offset)
+        offset += struct.unpack_from("<I", data, offset)[0]
+
+    # StringData: name, relative path, working dir, arguments, icon location, each if flagged
+    strings = {}
+    for flag, name in ((0x04, "name"), (0x08, "relative_path"), (0x10, "working_dir"), (0x20, "arguments"), (0x40, "icon_location")):
+        if link_flags & flag:
+            count = struct.unpack_from("<H", data, offset)[0]
+            offset += 2
+            size = count * 2 if is_unicode else count
+            raw = data[offset:offset + size]
+            strings[name] = raw.decode("utf-16-le") if is_unicode else decode_ansi(raw)
+            offset += size
+
+    if not target and link_flags & 0x200:  # HasExpString, target stored with environment variables
+        target = parse_environment_block(data, offset)
+    if not target and "relative_path" in strings:
+        target = os.path.normpath(os.path.join(os.path.dirname(lnk_path), strings["relative_path"]))
+    return target
+
+
+def parse_link_info(data, offset):
+    info_header_size, info_flags, _, local_base_path_offset, network_offset, suffix_offset = struct.unpack_from("<6I", data, offset + 4)
+    suffix = read_c_string(data, offset + suffix_offset) if suffix_offset else ""
+    if info_header_size >= 0x24:
+        local_base_path_offset_unicode, suffix_offset_unicode = struct.unpack_from("<2I", data, offset + 0x1C)
+        if suffix_offset_unicode:
+            suffix = read_c_string(data, offset + suffix_offset_unicode, unicode=True)
+        if info_flags & 0x01 and local_base_path_offset_unicode:
+            return read_c_string(data, offset + local_base_path_offset_unicode, unicode=True) + suffix
+    if info_flags & 0x01:  # VolumeIDAndLocalBasePath
+        return read_c_string(data, offset + local_base_path_offset) + suffix
+    if info_flags & 0x02:  # CommonNetworkRelativeLinkAndPathSuffix
+        network_offset += offset
+        net_name_offset = struct.unpack_from("<I", data, network_offset + 8)[0]
+        net_name = read_c_string(data, network_offset + net_name_offset)
+        if net_name_offset > 0x14:
+            net_name_offset_unicode = struct.unpack_from("<I", data, network_offset + 0x14)[0]
+            net_name = read_c_string(data, network_offset + net_name_offset_unicode, unicode=True)
+        return net_name + "\\" + suffix if suffix else net_name
+    return None
+
+
+def parse_environment_block(data, offset):
+    # ExtraData blocks follow StringData, the EnvironmentVariableDataBlock has signature 0xA0000001
+    while offset + 8 <= len(data):
+        block_size, signature = struct.unpack_from("<2I", data, offset)
+        if block_size < 8:
+            break
+        if signature == 0xA0000001:
+            target = data[offset + 268:offset + 788].decode("utf-16-le").split("\0", 1)[0]
+            if not target:
+                target = decode_ansi(data[offset + 8:offset + 268].split(b"\0", 1)[0])
+            return os.path.expandvars(target)
+        offset += block_size
+    return None
+
+
+class ShortcutResolver:
+    # Resolves .lnk targets with parse_shell_link and only asks WScript.Shell over COM for
+    # shortcuts the parser cannot handle. Targets are remembered per shortcut mtime and size and
+    # persisted between runs.
+    def __init__(self, cache_path=None):
+        self.cache_path = cache_path
+        self.targets = {}  # lnk path -> [mtime_ns, size, target]
+        self.lock = threading.Lock()
+        self.dirty = False
+        self.com = threading.local()  # COM objects belong to the thread that created them
+        self.load()
+
+    def resolve(self, lnk_path):
+        stat = os.stat(lnk_path)
+        with self.lock:
+            entry = self.targets.get(lnk_path)
+        if entry and entry[:2] == [stat.st_mtime_ns, stat.st_size]:
+            return entry[2]
+        try:
+            target = parse_shell_link(lnk_path)
+        except (ValueError, struct.error, IndexError, UnicodeDecodeError):
+            target = None
+        if target is None:
+            target = self.resolve_with_com(lnk_path)
+        with self.lock:
+            self.targets[lnk_path] = [stat.st_mtime_ns, stat.st_size, target]
+            self.dirty = True
+        return target
+
+    def resolve_with_com(self, lnk_path):
+        # None when pywin32 is missing, e.g. off Windows, or the shell cannot read the shortcut
+        try:
+            if not hasattr(self.com, "shell"):
+                import pythoncom
+                import win32com.client
+                pythoncom.CoInitialize()
+                self.com.shell = win32com.client.Dispatch("WScript.Shell")
+            return self.com.shell.CreateShortcut(lnk_path).TargetPath or None
+        except Exception:  # ImportError, or pywintypes.com_error which is only importable with pywin32
+            return None
+
+    def load(self):
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                self.targets = json.load(f)
+        except (OSError, ValueError):
+            self.targets = {}
+
+    def save(self):
+        if not self.cache_path or not self.dirty:
+            return
+        with self.lock:
+            targets = dict(self.targets)
+            self.dirty = False
+        write_file_atomic(self.cache_path, json.dumps(targets))
+
+
+class PreviewCache:
+    # LRU of script previews. Each entry remembers the mtime and size it was read at, so a
+    # changed script is read again. Only the head of a file is ever read.
+    def __init__(self, max_entries=PREVIEW_CACHE_SIZE, lines=PREVIEW_LINES):
+        self.max_entries = max_entries
+        self.lines = lines
+        self.entries = OrderedDict()  # path -> (mtime_ns, size, preview)
+        self.lock = threading.Lock()  # Shared with the prefetch thread
+        self.prefetch_generation = 0
+
+    def get(self, path, validate=True):
+        with self.lock:
+            entry = self.entries.get(path)
+        stat = os.stat(path) if validate or entry is None else None
+        if entry is not None and (stat is None or entry[:2] == (stat.st_mtime_ns, stat.st_size)):
+            with self.lock:
+                if path in self.entries:
+                    self.entries.move_to_end(path)
+            return entry[2]
+        preview = self.read_head(path)
+        with self.lock:
+            self.entries[path] = (stat.st_mtime_ns, stat.st_size, preview)
+            self.entries.move_to_end(path)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return preview
+
+    def read_head(self, path):
+        with open(path, "r", encoding="utf-8") as f:
+            head = f.read(PREVIEW_READ_LIMIT)
+        return "".join(head.splitlines(keepends=True)[:self.lines])
+
+    def invalidate(self, path):
+        with self.lock:
+            self.entries.pop(path, None)
+
+    def export(self):
+        # Least recently used first, so restoring keeps the LRU order
+        with self.lock:
+            return [[path, *entry] for path, entry in self.entries.items()]
+
+    def restore(self, entries):
+        with self.lock:
+            for path, mtime_ns, size, preview in entries:
+                self.entries[path] = (mtime_ns, size, preview)
+                self.entries.move_to_end(path)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def prefetch(self, paths):
+        # A newer prefetch supersedes the running one
+        self.prefetch_generation += 1
+        generation = self.prefetch_generation
+        thread = threading.Thread(target=self.run_prefetch, args=(paths[:self.max_entries], generation), name="PreviewPrefetch", daemon=True)
+        thread.start()
+
+    def run_prefetch(self, paths, generation):
+        for path in paths:
+            if generation != self.prefetch_generation:
+                return
+            try:
+                self.get(path)
+            except (OSError, UnicodeDecodeError):
+                pass
+
+
+class CatalogSnapshot:
+    # Last known state of the scripts folder, saved on exit so the next start can draw the grid
+    # before a slow share has been listed. Holds the mtime and size of each script and the
+    # cached previews; shortcut targets are already kept by ShortcutResolver.
+    def __init__(self, path):
+        self.path = path
+
+    def load(self, folder):
+        # ({file name: [mtime_ns, size]}, preview entries), or None without a snapshot of this folder
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(snapshot, dict) or snapshot.get("version") != CATALOG_SNAPSHOT_VERSION or snapshot.get("folder") != folder:
+            return None
+        return snapshot["files"], snapshot["previews"]
+
+    def save(self, folder, files, previews):
+        snapshot = {"version": CATALOG_SNAPSHOT_VERSION, "folder": folder, "files": files, "previews": previews}
+        write_file_atomic(self.path, json.dumps(snapshot, separators=(",", ":")))
+
+
+class FolderWatcher:
+    # Reports scripts added, removed, renamed or modified in a ScriptRoot from a background thread.
+    # Events are tuples of script keys put on a queue: ("added", key), ("removed", key),
+    # ("renamed", old, new) and ("modified", key). Linux uses inotify for a flat root,
+    # everything else polls os.scandir snapshots.
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_FROM = 0x040
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_CLOEXEC = 0o2000000
+    EVENT_HEADER = struct.Struct("iIII")
+
+    def __init__(self, root, events, poll_interval=WATCH_POLL_INTERVAL):
+        self.root = root
+        self.folder = root.path
+        self.events = events
+        self.poll_interval = poll_interval
+        self.stopped = threading.Event()
+        self.thread = None
+        self.native = False  # True while inotify reports every change, including content writes
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, name="FolderWatcher", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+
+    def run(self):
+        inotify_fd = self.open_inotify()
+        if inotify_fd is None:
+            self.poll()
+        else:
+            self.native = True
+            try:
+                self.watch_inotify(inotify_fd)
+            finally:
+                os.close(inotify_fd)
+
+    def open_inotify(self):
+        if not sys.platform.startswith("linux") or self.root.recursive:
+            return None  # An inotify watch does not cover subfolders
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            inotify_fd = libc.inotify_init1(self.IN_CLOEXEC)
+            if inotify_fd < 0:
+                return None
+            mask = self.IN_CLOSE_WRITE | self.IN_MOVED_FROM | self.IN_MOVED_TO | self.IN_CREATE | self.IN_DELETE
+            if libc.inotify_add_watch(inotify_fd, os.fsencode(self.folder), mask) < 0:
+                os.close(inotify_fd)
+                return None
+            return inotify_fd
+        except (OSError, AttributeError):
+            return None
+
+    def watch_inotify(self, inotify_fd):
+        while not self.stopped.is_set():
+            readable, _, _ = select.select([inotify_fd], [], [], 0.5)
+            if not readable:
+                continue
+            data = os.read(inotify_fd, 64 * 1024)
+            moved_from = {}  # cookie -> name, paired with the IN_MOVED_TO of the same rename
+            offset = 0
+            while offset < len(data):
+                _, mask, cookie, length = self.EVENT_HEADER.unpack_from(data, offset)
+                offset += self.EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                offset += length
+                if mask & self.IN_MOVED_FROM:
+                    moved_from[cookie] = name
+                elif mask & self.IN_MOVED_TO and cookie in moved_from:
+                    self.put_rename(moved_from.pop(cookie), name)
+                elif mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                    self.put("added", name)
+                elif mask & self.IN_DELETE:
+                    self.put("removed", name)
+                elif mask & self.IN_CLOSE_WRITE:
+                    self.put("modified", name)
+            # The other half of these moves is outside the folder
+            for name in moved_from.values():
+                self.put("removed", name)
+
+    def put(self, kind, name):
+        if self.root.accepts(name):
+            self.events.put((kind, self.root.get_key(name)))
+
+    def put_rename(self, old_name, new_name):
+        if not self.root.accepts(old_name):
+            self.put("added", new_name)
+        elif not self.root.accepts(new_name):
+            self.put("removed", old_name)
+        else:
+            self.events.put(("renamed", self.root.get_key(old_name), self.root.get_key(new_name)))
+
+    def snapshot(self):
+        return self.root.scan(inodes=True)
+
+    def poll(self):
+        folder_mtime = None
+        snapshot = None
+        ticks = 0
+        while not self.stopped.wait(self.poll_interval if snapshot is not None else 0):
+            ticks += 1
+            try:
+                # Adding, removing or renaming a file touches the folder itself, so an unchanged
+                # folder mtime saves listing a network share on every tick. Editing a script does
+                # not touch it, every WATCH_FULL_SCAN_TICKS ticks the folder is listed anyway to
+                # report those. Changes in subfolders do not touch it either, a recursive root
+                # is listed every time.
+                current_mtime = os.stat(self.folder).st_mtime_ns
+                if current_mtime == folder_mtime and not self.root.recursive and ticks < WATCH_FULL_SCAN_TICKS:
+                    continue
+                current = self.snapshot()
+            except OSError:
+                continue
+            ticks = 0
+            if snapshot is not None:
+                self.diff(snapshot, current)
+            folder_mtime = current_mtime
+            snapshot = current
+
+    def diff(self, old, new):
+        removed = {name: old[name] for name in old if name not in new}
+        added = {name: new[name] for name in new if name not in old}
+        # A file that kept its inode under a new name was renamed. Some network shares report
+        # inode 0, those renames show up as a removal and an addition.
+        removed_by_inode = {state[2]: name for name, state in removed.items() if state[2]}
+        for name, state in added.items():
+            old_name = removed_by_inode.pop(state[2], None) if state[2] else None
+            if old_name:
+                del removed[old_name]
+                self.events.put(("renamed", old_name, name))
+            else:
+                self.events.put(("added", name))
+        for name in removed:
+            self.events.put(("removed", name))
+        for name in new:
+            if name in old and new[name][:2] != old[name][:2]:
+                self.events.put(("modified", name))
+
+
+def get_output_encoding():
+    if sys.platform == "win32":
+        # Console programs write to pipes in the OEM code page, not the ANSI one
+        return f"cp{ctypes.windll.kernel32.GetOEMCP()}"
+    return locale.getpreferredencoding(False)
+
+
+def get_python_command():
+    # The interpreter running the app, unless frozen where sys.executable is Script Runner itself.
+    # The py launcher is installed with every python.org Python, "python" may be the Store alias.
+    if not getattr(sys, 'frozen', False):
+        return sys.executable
+    return "py" if sys.platform == "win32" else "python3"
+
+
+def get_script_command(file_path, console=False):
+    # Run the interpreter directly instead of going through "start" and a shell
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension in (".bat", ".cmd"):
+        return ["cmd", "/k" if console else "/c", file_path]
+    if extension == ".ps1":
+        return ["powershell", "-NoLogo", "-ExecutionPolicy", "Bypass"] + (["-NoExit"] if console else []) + ["-File", file_path]
+    if extension == ".sh":
+        return ["sh", file_path]
+    if extension == ".py":
+        return [get_python_command(), file_path]
+    return [file_path]
+
+
+class ScriptRun:
+    # One execution of a script, from queued until its process exited
+    def __init__(self, run_id, file_path, console=False, callback=None):
+        self.run_id = run_id
+        self.file_path = file_path
+        self.name = os.path.basename(file_path)
+        self.console = console  # Run in its own console window instead of capturing the output
+        self.state = "queued"
+        self.process = None
+        self.exit_code = None
+        self.queued_time = time.time()
+        self.start_time = None
+        self.end_time = None
+        self.output_size = 0
+        self.done = threading.Event()
+        self.callback = callback  # Called with the run from a worker thread once it finished or was cancelled
+
+    def get_duration(self):
+        if self.start_time is None:
+            return 0.0
+        return (self.end_time or time.time()) - self.start_time
+
+
+class ExecutionEngine:
+    # Starts scripts as direct child processes, at most max_concurrent at a time, and queues the
+    # rest. Output is read by one thread per run. Events are put on a queue as ("started", run),
+    # ("output", run, text) and ("finished", run), the UI drains it from the Tk thread.
+    def __init__(self, max_concurrent=MAX_CONCURRENT_RUNS):
+        self.max_concurrent = max_concurrent
+        self.events = queue.Queue()
+        self.pending = deque()
+        self.running = {}  # run id -> ScriptRun
+        self.lock = threading.Lock()
+        self.next_run_id = 1
+        self.encoding = get_output_encoding()
+
+    def submit(self, file_path, console=False, callback=None):
+        with self.lock:
+            run = ScriptRun(self.next_run_id, file_path, console, callback)
+            self.next_run_id += 1
+            if not console:
+                self.pending.append(run)
+        if console:
+            # A console stays open until the user closes it, so it does not take one of the slots
+            self.start(run)
+        else:
+            self.start_pending()
+        return run
+
+    def set_max_concurrent(self, max_concurrent):
+        self.max_concurrent = max_concurrent
+        self.start_pending()
+
+    def start_pending(self):
+        with self.lock:
+            runs = []
+            while self.pending and len(self.running) < self.max_concurrent:
+                run = self.pending.popleft()
+                self.running[run.run_id] = run
+                runs.append(run)
+        for run in runs:
+            self.start(run)
+
+    def start(self, run):
+        options = {}
+        if sys.platform == "win32":
+            options["creationflags"] = subprocess.CREATE_NEW_CONSOLE if run.console else subprocess.CREATE_NO_WINDOW
+        else:
+            # Its own process group, so stopping the run also stops what the script started
+            options["start_new_session"] = not run.console
+        try:
+            run.process = subprocess.Popen(
+                get_script_command(run.file_path, run.console),
+                cwd=os.path.dirname(run.file_path) or None,
+                stdin=None if run.console else subprocess.DEVNULL,
+                stdout=None if run.console else subprocess.PIPE,
+                stderr=None if run.console else subprocess.STDOUT,
+                **options,
+            )
+        except OSError as e:
+            run.start_time = time.time()
+            self.events.put(("output", run, f"Failed to start: {e}\n"))
+            self.finish(run, -1)
+            return
+        run.state = "running"
+        run.start_time = time.time()
+        self.events.put(("started", run))
+        threading.Thread(target=self.watch_run, args=(run,), name=f"ScriptRun-{run.run_id}", daemon=True).start()
+
+    def watch_run(self, run):
+        if not run.console:
+            decoder = codecs.getincrementaldecoder(self.encoding)(errors="replace")
+            partial_line = ""
+            # read1 returns whatever the pipe has, so output shows up while the script is running
+            for chunk in iter(lambda: run.process.stdout.read1(OUTPUT_CHUNK_SIZE), b""):
+                run.output_size += len(chunk)
+                lines, newline, partial_line = (partial_line + decoder.decode(chunk)).rpartition("\n")
+                if newline:
+                    self.events.put(("output", run, lines + newline))
+            partial_line += decoder.decode(b"", final=True)
+            if partial_line:
+                self.events.put(("output", run, partial_line + "\n"))
+            run.process.stdout.close()
+        self.finish(run, run.process.wait())
+
+    def finish(self, run, exit_code):
+        run.exit_code = exit_code
+        run.end_time = time.time()
+        run.state = "succeeded" if exit_code == 0 else "failed"
+        with self.lock:
+            self.running.pop(run.run_id, None)
+        self.events.put(("finished", run))
+        run.done.set()
+        if run.callback:
+            run.callback(run)
+        self.start_pending()
+
+    def cancel(self, run):
+        with self.lock:
+            cancelled = run in self.pending
+            if cancelled:
+                self.pending.remove(run)
+                run.state = "cancelled"
+        if cancelled:
+            run.done.set()
+            if run.callback:
+                run.callback(run)
+            return
+        if run.process and run.process.poll() is None:
+            self.terminate(run)
+
+    def terminate(self, run):
+        # A captured script has no window to close, so its children are stopped with it
+        try:
+            if sys.platform == "win32":
+                subprocess.run(["taskkill", "/T", "/F", "/PID", str(run.process.pid)], capture_output=True,
+                               creationflags=subprocess.CREATE_NO_WINDOW)
+            elif not run.console:
+                os.killpg(run.process.pid, signal.SIGTERM)
+            else:
+                run.process.terminate()
+        except OSError:
+            pass  # It exited meanwhile
+
+    def cancel_all(self):
+        # Queued runs first, so none of them takes the slot of a stopped one
+        with self.lock:
+            runs = list(self.pending) + list(self.running.values())
+        for run in runs:
+            self.cancel(run)
+
+    def get_runs(self):
+        # Captured runs that are running or queued, console runs are closed by the user
+        with self.lock:
+            return list(self.running.values()) + list(self.pending)
+
+    def get_counts(self):
+        with self.lock:
+            return len(self.running), len(self.pending)
+
+
+def parse_dependency_header(text):
+    # Script names listed in "REM depends: a.bat, b.bat" style header comments ("::" and "#" work too)
+    dependencies = []
+    for match in DEPENDENCY_HEADER.finditer(text):
+        dependencies.extend(name.strip() for name in match.group(1).split(",") if name.strip())
+    return dependencies
+
+
+def load_section_manifest(folder):
+    # Optional sections.cfg in the scripts folder. Each section lists "script = dependencies" and
+    # can set "order = a.bat, b.bat, c.bat" to run those one after another.
+    manifest = configparser.ConfigParser(delimiters=("=",))
+    manifest.optionxform = str  # Keys are file names, keep their case
+    try:
+        manifest.read(os.path.join(folder, SECTION_MANIFEST_FILE))
+    except configparser.Error:
+        return {}
+    dependencies = defaultdict(list)
+    for section_name in manifest.sections():
+        for key, value in manifest.items(section_name):
+            names = [name.strip() for name in value.split(",") if name.strip()]
+            if key == "order":
+                for previous, name in zip(names, names[1:]):
+                    dependencies[name].append(previous)
+            else:
+                dependencies[key].extend(names)
+    return dependencies
+
+
+def match_script_name(name, scripts):
+    # The key itself, or the key of a script whose file name is name with or without its extension
+    if name in scripts:
+        return name
+    for key in sorted(scripts):
+        file_name = os.path.basename(key)
+        if name in (file_name, os.path.splitext(file_name)[0]):
+            return key
+    return name
+
+
+def get_script_dependencies(folder, scripts, preview_cache):
+    # Header comments of each script plus the sections.cfg next to it, names may omit the extension
+    manifests = {}
+    dependencies = {}
+    for file_name, run_path in scripts.items():
+        script_folder = os.path.dirname(os.path.join(folder, file_name))
+        if script_folder not in manifests:
+            manifests[script_folder] = load_section_manifest(script_folder)
+        try:
+            header = preview_cache.get(run_path)
+        except (OSError, UnicodeDecodeError):
+            header = ""
+        names = parse_dependency_header(header) + manifests[script_folder].get(os.path.basename(file_name), [])
+        dependencies[file_name] = [match_script_name(name, scripts) for name in names]
+    return dependencies
+
+
+class RunScheduler:
+    # Runs a batch of scripts through ExecutionEngine. A script is submitted once every dependency
+    # inside the batch succeeded, so independent scripts run in parallel up to the engine limit.
+    # A failure skips its dependents; with stop_on_failure nothing new starts after it either.
+    def __init__(self, engine, name, scripts, dependencies, stop_on_failure=True):
+        self.engine = engine
+        self.name = name
+        self.scripts = scripts  # file name -> path to run
+        self.dependencies = {key: set(dependencies.get(key, ())) & set(scripts) - {key} for key in scripts}
+        self.stop_on_failure = stop_on_failure
+        self.runs = {}  # file name -> ScriptRun
+        self.results = {}  # file name -> final state
+        self.lock = threading.RLock()
+        self.stopped = False
+        self.start_time = None
+        self.end_time = None
+        self.done = threading.Event()
+        self.check_cycles()
+
+    def check_cycles(self):
+        remaining = {key: set(dependencies) for key, dependencies in self.dependencies.items()}
+        while remaining:
+            ready = [key for key, dependencies in remaining.items() if not dependencies]
+            if not ready:
+                raise ValueError("Dependency cycle between " + ", ".join(sorted(remaining)))
+            for key in ready:
+                del remaining[key]
+            for dependencies in remaining.values():
+                dependencies.difference_update(ready)
+
+    def start(self):
+        self.start_time = time.time()
+        self.submit_ready()
+
+    def submit_ready(self):
+        with self.lock:
+            # Skips cascade, a dependent of a skipped script is skipped too
+            changed = True
+            while changed:
+                changed = False
+                for key in self.scripts:
+                    if key not in self.runs and key not in self.results:
+                        if self.stopped or any(self.results.get(dependency, "succeeded") != "succeeded" for dependency in self.dependencies[key]):
+                            self.results[key] = "skipped"
+                            changed = True
+            ready = [key for key in self.scripts if key not in self.runs and key not in self.results
+                     and all(self.results.get(dependency) == "succeeded" for dependency in self.dependencies[key])]
+            for key in ready:
+                self.runs[key] = None  # Reserved, the engine may finish it before submit returns
+        for key in ready:
+            with self.lock:
+                if self.stopped:
+                    # An earlier script of this loop already failed, e.g. before the next one was submitted
+                    del self.runs[key]
+                    self.results[key] = "skipped"
+                    continue
+            run = self.engine.submit(self.scripts[key], callback=partial(self.on_run_finished, key))
+            with self.lock:
+                self.runs[key] = run
+                # Another script failed while this one was submitted, so on_run_finished did not see it
+                cancel = self.stopped and run.state == "queued"
+            if cancel:
+                self.engine.cancel(run)
+        self.check_done()
+
+    def on_run_finished(self, key, run):
+        to_cancel = []
+        with self.lock:
+            self.results[key] = run.state
+            if run.state != "succeeded" and self.stop_on_failure and not self.stopped:
+                self.stopped = True
+                to_cancel = [other for other in self.runs.values() if other is not None and other.state == "queued"]
+        for other in to_cancel:
+            self.engine.cancel(other)
+        self.submit_ready()
+
+    def check_done(self):
+        with self.lock:
+            if self.done.is_set() or len(self.results) < len(self.scripts):
+                return
+            self.end_time = time.time()
+            self.done.set()
+        self.engine.events.put(("batch_finished", self))
+
+    def get_summary(self):
+        counts = Counter(self.results.values())
+        wall_time = (self.end_time or time.time()) - self.start_time
+        serial_time = sum(run.get_duration() for run in self.runs.values() if run is not None)
+        return (f"{counts['succeeded']} succeeded, {counts['failed']} failed, {counts['skipped'] + counts['cancelled']} skipped "
+                f"in {wall_time:.1f}s, serial would take {serial_time:.1f}s (saved {serial_time - wall_time:.1f}s)")
+
+
+class RunHistory:
+    # Append-only SQLite log of finished runs next to config.cfg. record() only queues the run, a
+    # writer thread stores them in batches and applies the retention policy. Recent durations per
+    # script are kept in memory for the tooltips.
+    def __init__(self, path, max_runs_per_script=HISTORY_RUNS_PER_SCRIPT, max_age_days=HISTORY_MAX_AGE_DAYS):
+        self.path = path
+        self.max_runs_per_script = max_runs_per_script
+        self.max_age_days = max_age_days
+        self.records = queue.Queue()
+        self.stats = {}  # script path -> {"durations": deque, "runs": int, "last": (state, exit_code, end_time)}
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(target=self.run, name="RunHistory", daemon=True)
+        self.thread.start()
+
+    def record(self, run):
+        record = (run.file_path, run.start_time, run.end_time, run.exit_code, run.get_duration(), run.output_size, run.state)
+        self.add_stats(*record)
+        self.records.put(record)
+
+    def add_stats(self, script, start_time, end_time, exit_code, duration, output_size, state):
+        with self.lock:
+            stats = self.stats.setdefault(script, {"durations": deque(maxlen=HISTORY_STATS_WINDOW), "runs": 0, "last": None})
+            stats["durations"].append(duration)
+            stats["runs"] += 1
+            stats["last"] = (state, exit_code, end_time)
+
+    def get_stats(self, script):
+        # (runs, p50, p95, last result) or None for a script that never ran
+        with self.lock:
+            stats = self.stats.get(script)
+            if not stats:
+                return None
+            durations = sorted(stats["durations"])
+            runs, last = stats["runs"], stats["last"]
+        p50 = durations[int(0.50 * (len(durations) - 1))]
+        p95 = durations[int(0.95 * (len(durations) - 1))]
+        return runs, p50, p95, last
+
+    def close(self):
+        self.records.put(None)
+        self.thread.join(timeout=5)
+
+    def run(self):
+        # The connection belongs to this thread, nothing on the Tk thread ever waits for SQLite
+        import sqlite3
+        connection = sqlite3.connect(self.path)
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("CREATE TABLE IF NOT EXISTS runs (id INTEGER PRIMARY KEY, script TEXT NOT NULL, start_time REAL, "
+                               "end_time REAL, exit_code INTEGER, duration REAL, output_size INTEGER, state TEXT)")
+            connection.execute("CREATE INDEX IF NOT EXISTS runs_script ON runs (script, id)")
+            self.compact(connection)
+            self.load_stats(connection)
+            last_compaction = time.time()
+            closing = False
+            while not closing:
+                batch = [self.records.get()]
+                # Whatever arrives shortly after the first record goes into the same transaction
+                deadline = time.time() + HISTORY_FLUSH_DELAY
+                while len(batch) < HISTORY_BATCH_SIZE and batch[-1] is not None:
+                    try:
+                        batch.append(self.records.get(timeout=max(0.0, deadline - time.time())))
+                    except queue.Empty:
+                        break
+                closing = batch[-1] is None
+                records = [record for record in batch if record is not None]
+                if records:
+                    with connection:
+                        connection.executemany("INSERT INTO runs (script, start_time, end_time, exit_code, duration, output_size, state) "
+                                               "VALUES (?, ?, ?, ?, ?, ?, ?)", records)
+                if time.time() - last_compaction > HISTORY_COMPACT_INTERVAL:
+                    self.compact(connection)
+                    last_compaction = time.time()
+        finally:
+            connection.close()
+
+    def compact(self, connection):
+        # Retention: drop runs older than max_age_days and keep at most max_runs_per_script per script
+        with connection:
+            connection.execute("DELETE FROM runs WHERE start_time < ?", (time.time() - self.max_age_days * 86400,))
+            connection.execute("DELETE FROM runs WHERE id IN (SELECT id FROM (SELECT id, ROW_NUMBER() OVER "
+                               "(PARTITION BY script ORDER BY id DESC) AS position FROM runs) WHERE position > ?)",
+                               (self.max_runs_per_script,))
+        connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def load_stats(self, connection):
+        # Only the most recent runs of each script feed the percentiles
+        stats = {}
+        rows = connection.execute("SELECT script, duration, exit_code, end_time, state FROM "
+                                  "(SELECT *, ROW_NUMBER() OVER (PARTITION BY script ORDER BY id DESC) AS position FROM runs) "
+                                  "WHERE position <= ? ORDER BY id", (HISTORY_STATS_WINDOW,))
+        counts = dict(connection.execute("SELECT script, COUNT(*) FROM runs GROUP BY script"))
+        for script, duration, exit_code, end_time, state in rows:
+            entry = stats.setdefault(script, {"durations": deque(maxlen=HISTORY_STATS_WINDOW), "runs": counts[script], "last": None})
+            entry["durations"].append(duration)
+            entry["last"] = (state, exit_code, end_time)
+        with self.lock:
+            # Runs recorded while loading are already in self.stats and are newer
+            for script, entry in self.stats.items():
+                if script in stats:
+                    stats[script]["durations"].extend(entry["durations"])
+                    stats[script]["runs"] += entry["runs"]
+                    stats[script]["last"] = entry["last"]
+                else:
+                    stats[script] = entry
+            self.stats = stats
+
+
+class StartupProfiler:
+    # Per-phase timing of the app start, measured from the import of this module
+    def __init__(self, enabled):
+        self.enabled = enabled
+        self.phases = [("imports", MODULE_LOADED_AT - MODULE_IMPORT_STARTED_AT)]
+        self.last = MODULE_LOADED_AT
+        self.finished = False
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last))
+        self.last = now
+
+    def report(self):
+        self.finished = True
+        if not self.enabled:
+            return
+        lines = [f"{phase:<20} {duration * 1000:>8.1f} ms" for phase, duration in self.phases]
+        lines.append(f"{'total':<20} {(self.last - MODULE_IMPORT_STARTED_AT) * 1000:>8.1f} ms")
+        report = "\n".join(lines)
+        if sys.stdout:
+            print(report, flush=True)
+        else:
+            # The windowed PyInstaller build has no console to print to
+            messagebox.showinfo("Startup Profile", report)
+
+
+class Span:
+    __slots__ = ("recorder", "name", "started_at")
+
+    def __init__(self, recorder, name):
+        self.recorder = recorder
+        self.name = name
+
+    def __enter__(self):
+        self.started_at = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.recorder.record(self.name, self.started_at, time.perf_counter() - self.started_at)
+        return False
+
+
+class NullSpan:
+    # Returned while recording is off, so an instrumented call only pays for one method call
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NULL_SPAN = NullSpan()
+
+
+class SpanRecorder:
+    # Timing spans of the hot paths. The last spans are kept in a ring buffer for the trace export
+    # and the percentiles, the histograms count every span since recording started.
+    def __init__(self, enabled=False, size=SPAN_BUFFER_SIZE):
+        self.enabled = enabled
+        self.spans = deque(maxlen=size)  # (name, started at, duration, thread id)
+        self.histograms = {}  # Name -> span count per SPAN_HISTOGRAM_BUCKETS_MS bucket, plus one for slower spans
+        self.totals = {}  # Name -> [count, total seconds, longest seconds]
+        self.lock = threading.Lock()  # Spans are also recorded by the loader and watcher threads
+
+    def span(self, name):
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name)
+
+    def record(self, name, started_at, duration):
+        with self.lock:
+            self.spans.append((name, started_at, duration, threading.get_ident()))
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = [0] * (len(SPAN_HISTOGRAM_BUCKETS_MS) + 1)
+                self.totals[name] = [0, 0.0, 0.0]
+            histogram[bisect.bisect_right(SPAN_HISTOGRAM_BUCKETS_MS, duration * 1000)] += 1
+            totals = self.totals[name]
+            totals[0] += 1
+            totals[1] += duration
+            totals[2] = max(totals[2], duration)
+
+    def clear(self):
+        with self.lock:
+            self.spans.clear()
+            self.histograms.clear()
+            self.totals.clear()
+
+    def get_stats(self):
+        # (name, count, mean ms, p50 ms, p95 ms, max ms, histogram), the percentiles from the buffered spans
+        with self.lock:
+            recent = defaultdict(list)
+            for name, _, duration, _ in self.spans:
+                recent[name].append(duration)
+            stats = []
+            for name, (count, total, longest) in sorted(self.totals.items()):
+                durations = sorted(recent[name]) or [0.0]
+                stats.append((name, count, total / count * 1000, durations[(len(durations) - 1) // 2] * 1000,
+                              durations[int(0.95 * (len(durations) - 1))] * 1000, longest * 1000, list(self.histograms[name])))
+            return stats
+
+    def export_chrome_trace(self, path):
+        # Chrome trace event format, opened by chrome://tracing and ui.perfetto.dev. Times are in
+        # microseconds since this module was imported.
+        with self.lock:
+            spans = list(self.spans)
+        events = [{"name": name, "cat": "script_runner", "ph": "X", "pid": os.getpid(), "tid": thread_id,
+                   "ts": round((started_at - MODULE_IMPORT_STARTED_AT) * 1e6, 1), "dur": round(duration * 1e6, 1)}
+                  for name, started_at, duration, thread_id in spans]
+        write_file_atomic(path, json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}))
+        return len(events)
+
 
 class BatFileRunner:
-    def __init__(self):
+    def __init__(self, profile_startup=False):
+        self.profiler = StartupProfiler(profile_startup)
+        self.spans = SpanRecorder()  # Off unless "record_timings" is set or switched on in the Diagnostics window
+        import_tk()
+        self.profiler.mark("import tkinter")
         self.app_version = "1.1.2"
         self.build_date = self.get_build_date()
 
         self.bat_files_folder = ""
         self.search_keyword = ""
-        self.sections = {}
+        self.search_after_id = None
+        self.search_contents = False  # Also match the text inside the scripts
+        self.fuzzy_search = False  # Also match names that are similar to the query
+        self.catalog = ScriptCatalog()
+        self.preview_cache = PreviewCache()
+        self.shortcuts = ShortcutResolver(get_config_path(SHORTCUT_CACHE_FILE))
+        self.catalog_snapshot = CatalogSnapshot(get_config_path(CATALOG_SNAPSHOT_FILE))
+        self.engine = ExecutionEngine()
+        self.history = RunHistory(get_config_path(HISTORY_FILE))
+        self.capture_output = True  # Show script output in the log pane, otherwise open a console per run
+        self.selected_files = set()  # Ctrl+clicked scripts for "Run Selected"
+        self.prefetch_previews_enabled = False  # Read the previews in the background after each refresh
+        self.bat_files = []
+        self.file_states = {}  # File name -> [mtime_ns, size] when the folder was last listed
+        self.from_snapshot = False  # The grid shows the saved snapshot until the folder is listed
+        self.catalog_pending = False  # The snapshot is drawn while the catalog is built in the background
+        self.section_files = {}
+        self.script_rows = {}  # Rows currently on screen, keyed by file name
+        self.free_rows = []  # Pooled rows waiting to be recycled for the next script scrolled into view
+        self.grid_rows = []
+        self.grid_row_tops = []
+        self.row_height = 30
+        self.column_width = 300
+        self.section_header_height = SECTION_HEADER_HEIGHT
+        self.render_after_id = None
+        self.catalog_results = queue.Queue()
+        self.catalog_loaded = False
+        self.content_results = queue.Queue()
+        self.contents_loading = False  # Script heads are being read for the content search
+        self.watch_folder = True  # Follow changes in the folder instead of relying on Refresh
+        self.watchers = []  # One per script root
+        self.frecency = {}  # Script key -> add_frecency score of its runs
+        self.quick_launcher = None
+        self.diagnostics_window = None
+        self.watch_events = queue.Queue()
+        self.watch_after_id = None
+        self.widget_stats = Counter()  # Widgets created and pooled rows recycled, read by benchmarks/bench_refresh_ui.py
         self.message_frame = None
         self.max_sections_per_row = 4  # Default value for max sections per row
 
         self.skip_validation = True  # Track the state of the "Skip Validation" checkbox
 
-        self.config = configparser.ConfigParser()
-        self.config.read("config.cfg")
+        self.settings = Settings(get_config_dir())
+        self.config = self.settings.config
         self.bat_files_folder = self.config.get("Settings", "bat_files_folder")
+        self.roots = ScriptRoots.from_config(self.config, self.bat_files_folder)
+        self.catalog.get_section = self.roots.get_section
+        self.load_frecency()
 
         if self.config.has_option("Settings", "max_sections_per_row"):
             self.max_sections_per_row = self.config.getint("Settings", "max_sections_per_row")
 
+        if self.config.has_option("Settings", "prefetch_previews"):
+            self.prefetch_previews_enabled = self.config.getboolean("Settings", "prefetch_previews")
+
+        if self.config.has_option("Settings", "max_concurrent_runs"):
+            self.engine.set_max_concurrent(self.config.getint("Settings", "max_concurrent_runs"))
+
+        if self.config.has_option("Settings", "capture_output"):
+            self.capture_output = self.config.getboolean("Settings", "capture_output")
+
+        if self.config.has_option("Settings", "watch_folder"):
+            self.watch_folder = self.config.getboolean("Settings", "watch_folder")
+
+        if self.config.has_option("Settings", "record_timings"):
+            self.spans.enabled = self.config.getboolean("Settings", "record_timings")
+
+        self.profiler.mark("config")
         self.root = tk.Tk()
         self.root.title("Script Runner " + self.app_version)
+        self.profiler.mark("tk root")
+        self.icons = IconCache(get_resource_path("res/img"))
         self.setup_ui()
 
     def get_build_date(self):
@@ -47,10 +1664,112 @@ class BatFileRunner:
 
     def run_bat(self, file_path):
         if not self.skip_validation:
-            subprocess.Popen(["start", "cmd", "/k", file_path], shell=True)
+            self.start_script(file_path)
         else:
             if messagebox.askokcancel("Run Script", f"Are you sure you want to run {os.path.basename(file_path)}?"):
-                subprocess.Popen(["start", "cmd", "/k", file_path], shell=True)
+                self.start_script(file_path)
+
+    def start_script(self, file_path):
+        with self.spans.span("start_script"):
+            run_path = self.get_run_path(file_path)
+            if run_path is None:
+                # Shortcuts to programs or documents are opened by the shell and are not tracked
+                self.open_with_shell(file_path)
+                return None
+            self.record_launch(file_path)
+            return self.engine.submit(run_path, console=not self.capture_output)
+
+    def record_launch(self, file_path):
+        file_path = os.path.abspath(file_path)
+        file_name = self.roots.get_key(file_path)
+        self.frecency[file_name] = add_frecency(self.frecency.get(file_name), time.time())
+        self.settings.set_script_value(file_path, "frecency", self.frecency[file_name])
+        self.settings.increment_script_value(file_path, "runs")
+
+    def load_frecency(self):
+        # Frecency of the scripts by catalog key, the settings keep it by path
+        self.frecency = {self.roots.get_key(file_path): score for file_path, score in self.settings.get_script_values("frecency").items()}
+
+    def rank_scripts(self, query, limit=QUICK_LAUNCH_RESULTS):
+        if query:
+            # Similar names only when nothing matches, e.g. a typo, they cost a pass over the index
+            return (self.catalog.search(query, search_contents=self.search_contents, limit=limit, scores=self.frecency)
+                    or self.catalog.search(query, fuzzy=True, limit=limit, scores=self.frecency))
+        # Nothing typed yet, the most used scripts then the rest in name order
+        used = heapq.nlargest(limit, (file_name for file_name in self.frecency if file_name in self.catalog.names), key=self.frecency.get)
+        return used + [file_name for file_name in self.catalog.search("", limit=limit) if file_name not in used][:limit - len(used)]
+
+    def show_quick_launcher(self, event=None):
+        if self.quick_launcher is None:
+            self.quick_launcher = QuickLauncher(self)
+        self.quick_launcher.show()
+        return "break"
+
+    def get_run_path(self, file_path):
+        # The script the engine runs for a file, a shortcut runs its target if that is a script
+        if not file_path.endswith(".lnk"):
+            return file_path
+        target_path = self.get_target_from_shortcut(file_path)
+        if target_path and os.path.exists(target_path) and target_path.endswith(RUNNABLE_EXTENSIONS):
+            return target_path
+        return None
+
+    def run_section(self, section_name):
+        self.run_batch(f"Section {section_name}", self.section_files.get(section_name, []))
+
+    def run_selected(self):
+        self.run_batch("Selection", [file_name for file_name in self.bat_files if file_name in self.selected_files])
+
+    def run_batch(self, name, file_names):
+        if not file_names:
+            return
+        if self.skip_validation and not messagebox.askokcancel("Run Scripts", f"Are you sure you want to run the {len(file_names)} scripts of {name}?"):
+            return
+        scripts = {}
+        for file_name in file_names:
+            run_path = self.get_run_path(os.path.join(self.bat_files_folder, file_name))
+            if run_path:
+                scripts[file_name] = run_path
+            else:
+                self.append_log(f"[{name}] skipping {file_name}, its target is not a script\n")
+        try:
+            scheduler = RunScheduler(self.engine, name, scripts, get_script_dependencies(self.bat_files_folder, scripts, self.preview_cache), self.stop_batch_on_failure.get())
+        except ValueError as e:
+            messagebox.showerror("Error", f"Cannot run {name}: {str(e)}")
+            return
+        self.append_log(f"[{name}] running {len(scripts)} scripts\n")
+        scheduler.start()
+
+    def toggle_selection(self, file_name):
+        if file_name in self.selected_files:
+            self.selected_files.discard(file_name)
+        else:
+            self.selected_files.add(file_name)
+        if file_name in self.script_rows:
+            self.update_row_selection(self.script_rows[file_name])
+        return "break"  # Keep the button from running the script
+
+    def select_section(self, section_name):
+        self.selected_files.update(self.section_files.get(section_name, []))
+        for row in self.script_rows.values():
+            self.update_row_selection(row)
+
+    def clear_selection(self):
+        self.selected_files.clear()
+        for row in self.script_rows.values():
+            self.update_row_selection(row)
+
+    def update_row_selection(self, row):
+        row.button.config(relief=tk.SUNKEN if row.file_name in self.selected_files else tk.RAISED)
+
+    def open_with_shell(self, file_path):
+        try:
+            if sys.platform == "win32":
+                os.startfile(file_path)
+            else:
+                subprocess.Popen(["xdg-open", file_path])
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to open {os.path.basename(file_path)}: {str(e)}")
 
     def run_bat_as_admin(self, file_path):
         if messagebox.askokcancel("Run Script as Admin", f"Are you sure you want to run {os.path.basename(file_path)} with elevated rights?"):
@@ -70,8 +1789,8 @@ class BatFileRunner:
         file_path = os.path.join(self.bat_files_folder, file)
         if file.endswith(".lnk"):
             target_path = self.get_target_from_shortcut(file_path)
-            if target_path and os.path.exists(target_path) and target_path.endswith(".bat"):
-                file_path = target_path  # Use the target path only if it's a .bat file
+            if target_path and os.path.exists(target_path) and target_path.endswith(RUNNABLE_EXTENSIONS):
+                file_path = target_path  # Use the target path only if it's a script
         try:
             if sys.platform == "win32":
                 os.startfile(file_path, "edit")
@@ -84,54 +1803,143 @@ class BatFileRunner:
         selected_folder = filedialog.askdirectory(title="Select Default Folder")
         if selected_folder:
             self.bat_files_folder = selected_folder
-            self.config.set("Settings", "bat_files_folder", self.bat_files_folder)
-            with open("config.cfg", "w") as config_file:
-                self.config.write(config_file)
+            self.settings.set("Settings", "bat_files_folder", self.bat_files_folder)
+            self.roots = ScriptRoots.from_config(self.config, self.bat_files_folder)
+            self.catalog.get_section = self.roots.get_section
+            self.load_frecency()
             self.refresh_ui()
+            if self.watch_folder and self.catalog_loaded:
+                self.start_watcher()
 
     def set_max_sections_per_row(self):
         new_value = simpledialog.askinteger("Set Columns", "Enter max number of sections per row:",
                                             minvalue=1, maxvalue=10, initialvalue=self.max_sections_per_row)
         if new_value is not None and new_value != self.max_sections_per_row:
             self.max_sections_per_row = new_value
-            self.config.set("Settings", "max_sections_per_row", str(new_value))
-            with open("config.cfg", "w") as config_file:
-                self.config.write(config_file)
-            self.refresh_ui()
+            self.settings.set("Settings", "max_sections_per_row", new_value)
+            self.update_layout()
+
+    def set_max_concurrent_runs(self):
+        new_value = simpledialog.askinteger("Set Concurrent Runs", "Enter max number of scripts running at the same time:",
+                                            minvalue=1, maxvalue=64, initialvalue=self.engine.max_concurrent)
+        if new_value is not None and new_value != self.engine.max_concurrent:
+            self.engine.set_max_concurrent(new_value)
+            self.settings.set("Settings", "max_concurrent_runs", new_value)
+
+    def toggle_capture_output(self):
+        self.capture_output = not self.capture_output
+        self.settings.set("Settings", "capture_output", self.capture_output)
 
     def search_files(self, event):
+        # Debounce typing, only the query left once the user pauses is applied
+        if self.search_after_id:
+            self.root.after_cancel(self.search_after_id)
+        self.search_after_id = self.root.after(SEARCH_DEBOUNCE_MS, self.apply_search)
+
+    def apply_search(self):
+        self.search_after_id = None
         self.search_keyword = self.search_entry.get().lower()
-        self.refresh_ui()
+        with self.spans.span("apply_search"):
+            self.apply_search_filter()
 
     def clear_search(self):
+        if self.search_after_id:
+            self.root.after_cancel(self.search_after_id)
+            self.search_after_id = None
         self.search_entry.delete(0, tk.END)
         self.search_keyword = ""
-        self.refresh_ui()
-
-    def create_button(self, frame, text, command):
-        button = tk.Button(frame, text=text, width=self.max_button_width - 10, command=command)
+        self.apply_search_filter()
+
+    def toggle_search_contents(self):
+        self.search_contents = not self.search_contents
+        self.catalog.set_index_contents(self.search_contents)
+        self.index_contents()
+        self.apply_search_filter()
+
+    def index_contents(self):
+        # Reading every script can take long on a network share, so the heads are read on a
+        # background thread and searched once they arrive
+        if self.contents_loading or not self.catalog.stale_contents:
+            return
+        self.contents_loading = True
+        catalog = self.catalog
+        threading.Thread(target=self.load_contents, args=(catalog, catalog.folder, catalog.take_stale_contents()),
+                         name="ContentIndexer", daemon=True).start()
+        self.root.after(CATALOG_POLL_MS, self.check_contents_loaded)
+
+    def load_contents(self, catalog, folder, file_names):
+        with self.spans.span("index_contents"):
+            contents = {file_name: catalog.read_contents(file_name) for file_name in file_names}
+        self.content_results.put((catalog, folder, contents))
+
+    def check_contents_loaded(self):
+        try:
+            catalog, folder, contents = self.content_results.get_nowait()
+        except queue.Empty:
+            self.root.after(CATALOG_POLL_MS, self.check_contents_loaded)
+            return
+        self.contents_loading = False
+        if catalog is self.catalog and folder == catalog.folder:
+            catalog.set_contents(contents)
+            if self.search_keyword and self.search_contents:
+                self.apply_search_filter()
+        self.index_contents()  # Scripts added or modified while these were read
+
+    def toggle_fuzzy_search(self):
+        self.fuzzy_search = not self.fuzzy_search
+        self.apply_search_filter()
+
+    def create_button(self, frame, row):
+        # Commands read row.file_name when they run, so the row can be recycled for another script
+        button = tk.Button(frame, width=self.max_button_width - 10, command=lambda: self.run_bat(os.path.join(self.bat_files_folder, row.file_name)))
         button.pack(side=tk.LEFT)
 
-        # Create a right-click menu for the button
-        button_menu = tk.Menu(button, tearoff=0)
+        # Bind the right-click event to the button, all rows share one menu
+        button.bind("<Button-3>", lambda event: self.post_script_menu(event, row.file_name))
 
-        # Add commands with icons to the menu
-        button_menu.add_command(label="Rename", image=self.rename_icon, compound=tk.LEFT, command=lambda: self.rename_script(os.path.join(self.bat_files_folder, text)))
-        # button_menu.add_command(label="Run as Admin", image=self.admin_icon, compound=tk.LEFT, command=lambda: self.run_bat_as_admin(os.path.join(self.bat_files_folder, text)))
-        button_menu.add_command(label="Edit", image=self.edit_icon, compound=tk.LEFT, command=lambda: self.edit_script(os.path.join(self.bat_files_folder, text)))
-        button_menu.add_command(label="Delete", image=self.trash_icon, compound=tk.LEFT, command=lambda: self.delete_script(os.path.join(self.bat_files_folder, text)))
-        button_menu.add_command(label="Duplicate", image=self.duplicate_icon, compound=tk.LEFT, command=lambda: self.duplicate_script(text))
-
-        # Bind the right-click event to the button
-        button.bind("<Button-3>", lambda event: button_menu.post(event.x_root, event.y_root))
+        # Ctrl+click adds the script to the selection for "Run Selected"
+        button.bind("<Control-Button-1>", lambda event: self.toggle_selection(row.file_name))
 
         # Bind tooltip functionality
-        button.bind("<Enter>", lambda event, file=text: self.show_tooltip(event, file))
+        button.bind("<Enter>", lambda event: self.show_tooltip(event, row.file_name))
         button.bind("<Leave>", self.hide_tooltip)
+        return button
+
+    def create_script_menu(self):
+        self.script_menu = tk.Menu(self.root, tearoff=0)
+        self.script_menu.images = [self.rename_icon, self.edit_icon, self.trash_icon, self.duplicate_icon]  # Keep a reference
+        self.script_menu_file = None
 
+        # Add commands with icons to the menu
+        self.script_menu.add_command(label="Rename", image=self.rename_icon, compound=tk.LEFT, command=lambda: self.rename_script(os.path.join(self.bat_files_folder, self.script_menu_file)))
+        # self.script_menu.add_command(label="Run as Admin", image=self.admin_icon, compound=tk.LEFT, command=lambda: self.run_bat_as_admin(os.path.join(self.bat_files_folder, self.script_menu_file)))
+        self.script_menu.add_command(label="Edit", image=self.edit_icon, compound=tk.LEFT, command=lambda: self.edit_script(os.path.join(self.bat_files_folder, self.script_menu_file)))
+        self.script_menu.add_command(label="Delete", image=self.trash_icon, compound=tk.LEFT, command=lambda: self.delete_script(os.path.join(self.bat_files_folder, self.script_menu_file)))
+        self.script_menu.add_command(label="Duplicate", image=self.duplicate_icon, compound=tk.LEFT, command=lambda: self.duplicate_script(self.script_menu_file))
+        self.favorite_var = tk.BooleanVar(value=False)
+        self.script_menu.add_checkbutton(label="Favorite", variable=self.favorite_var, command=lambda: self.toggle_favorite(self.script_menu_file))
+
+    def create_section_menu(self):
+        self.section_menu = tk.Menu(self.root, tearoff=0)
+        self.section_menu_name = None
+        self.section_menu.add_command(label="Run Section", command=lambda: self.run_section(self.section_menu_name))
+        self.section_menu.add_command(label="Select Section", command=lambda: self.select_section(self.section_menu_name))
+
+    def post_section_menu(self, event, section_name):
+        self.section_menu_name = section_name
+        self.section_menu.post(event.x_root, event.y_root)
+
+    def post_script_menu(self, event, file_name):
+        self.script_menu_file = file_name
+        file_path = os.path.abspath(os.path.join(self.bat_files_folder, file_name))
+        self.favorite_var.set(self.settings.get_script_value(file_path, "favorite", False))
+        self.script_menu.post(event.x_root, event.y_root)
 
     def show_tooltip(self, event, file):
         tooltip_text = self.get_script_preview(file)
+        run_statistics = self.get_run_statistics(file)
+        if run_statistics:
+            tooltip_text = f"{run_statistics}\n\n{tooltip_text}"
         x, y, _, _ = event.widget.bbox("insert")
         x += event.widget.winfo_rootx() + 25
         y += event.widget.winfo_rooty() + 25
@@ -141,23 +1949,34 @@ class BatFileRunner:
         label = tk.Label(self.tooltip, text=tooltip_text, background="white", relief="solid", borderwidth=1)
         label.pack()
 
+    def get_run_statistics(self, file):
+        run_path = self.get_run_path(os.path.join(self.bat_files_folder, file))
+        stats = self.history.get_stats(run_path) if run_path else None
+        if not stats:
+            return None
+        runs, p50, p95, (state, exit_code, end_time) = stats
+        last_run = datetime.fromtimestamp(end_time).strftime("%Y-%m-%d %H:%M")
+        return f"Runs: {runs} | p50: {p50:.1f}s | p95: {p95:.1f}s | Last: {state} (exit {exit_code}) at {last_run}"
+
     def hide_tooltip(self, event):
         if hasattr(self, 'tooltip'):
             self.tooltip.destroy()
 
     def get_script_preview(self, file):
+        with self.spans.span("get_script_preview"):
+            return self.read_script_preview(file)
+
+    def read_script_preview(self, file):
         file_path = os.path.join(self.bat_files_folder, file)
+        # inotify reports every write, so its events keep the cache fresh without a stat per hover
+        validate = not (self.watchers and all(watcher.native for watcher in self.watchers))
         try:
-            if file.endswith(".bat"):
-                with open(file_path, "r", encoding="utf-8") as f:
-                    lines = f.readlines()
-                return "".join(lines[:20])  # Display first 20 lines of the bat file
+            if file.endswith(RUNNABLE_EXTENSIONS):
+                return self.preview_cache.get(file_path, validate)  # Display first 20 lines of the bat file
             elif file.endswith(".lnk"):
                 target_path = self.get_target_from_shortcut(file_path)
                 if target_path and os.path.exists(target_path):
-                    with open(target_path, "r", encoding="utf-8") as f:
-                        lines = f.readlines()
-                    return "".join(lines[:20])  # Display first 20 lines of the target file
+                    return self.preview_cache.get(target_path)  # Display first 20 lines of the target file
                 else:
                     return "Target file not found"
             else:
@@ -167,102 +1986,257 @@ class BatFileRunner:
 
     def get_target_from_shortcut(self, lnk_file):
         try:
-            shell = win32com.client.Dispatch("WScript.Shell")
-            shortcut = shell.CreateShortcut(lnk_file)
-            return shortcut.TargetPath
+            with self.spans.span("get_target_from_shortcut"):
+                return self.shortcuts.resolve(lnk_file)
         except Exception as e:
             return f"Error reading shortcut: {str(e)}"
 
 
     def duplicate_script(self, file_name):
         old_path = os.path.join(self.bat_files_folder, file_name)
-        new_name = file_name.split('.')[0] + '_copy.bat'
+        name, extension = os.path.splitext(file_name)
+        new_name = name + '_copy' + extension
         new_path = os.path.join(self.bat_files_folder, new_name)
         try:
-            shutil.copy(old_path, new_path)
-            self.refresh_ui()
+            with self.spans.span("duplicate_script"):
+                shutil.copy(old_path, new_path)
+                self.apply_folder_events([("added", new_name)])
         except Exception as e:
             messagebox.showerror("Error", f"Failed to duplicate the script: {str(e)}")
 
     def refresh_ui(self):
-
-        if hasattr(sys, '_MEIPASS'):
-            # Running as a bundled executable
-            img_path = os.path.join(sys._MEIPASS, "res/img")
-        else:
-            # Running as a regular Python script
-            img_path = "res/img"
-
-        # Update footer with statistics
-        total_scripts = len(self.bat_files)
-        self.footer_label.config(text=f"Total Scripts and Links: {total_scripts} | App Version: {self.app_version} | Build: {self.build_date}")
-
-        # Load and resize the trash bin icon to 16x16
-        self.trash_icon = ImageTk.PhotoImage(Image.open(os.path.join(img_path, "recycle-bin.png")).resize((20, 20), Image.ADAPTIVE))
-        self.edit_icon = ImageTk.PhotoImage(Image.open(os.path.join(img_path, "edit.png")).resize((20, 20), Image.ADAPTIVE))
-        self.rename_icon = ImageTk.PhotoImage(Image.open(os.path.join(img_path, "edit-text.png")).resize((20, 20), Image.ADAPTIVE))
-        self.admin_icon = ImageTk.PhotoImage(Image.open(os.path.join(img_path, "admin.png")).resize((20, 20), Image.ADAPTIVE))
-        self.duplicate_icon = ImageTk.PhotoImage(Image.open(os.path.join(img_path, "duplicate.png")).resize((20, 20), Image.ADAPTIVE))
-
-        img = Image.open(os.path.join(img_path, "icon.png"))
-        icon = ImageTk.PhotoImage(img)
-        self.root.iconphoto(True, icon)
-
-        for section in self.sections.values():
-            section.destroy()
-
+        with self.spans.span("refresh_ui"):
+            with self.spans.span("scan_folders"):
+                self.file_states = self.roots.scan()
+            self.from_snapshot = False
+            self.catalog_pending = False
+            self.bat_files = sorted(self.file_states)
+            self.update_script_widgets()
+
+    def load_icons(self):
+        # Icons are cached per size, so this only touches the disk the first time
+        with self.spans.span("load_icons"):
+            self.load_icon_images()
+
+    def load_icon_images(self):
+        icon_size = self.get_icon_size()
+        self.trash_icon = self.icons.get("recycle-bin", icon_size)
+        self.edit_icon = self.icons.get("edit", icon_size)
+        self.rename_icon = self.icons.get("edit-text", icon_size)
+        self.admin_icon = self.icons.get("admin", icon_size)
+        self.duplicate_icon = self.icons.get("duplicate", icon_size)
+
+    def get_icon_size(self):
+        # Scale the 20px icons up on HiDPI screens, 96 dpi being the usual baseline
+        return max(ICON_SIZE, round(ICON_SIZE * self.root.winfo_fpixels("1i") / 96))
+
+    def update_script_widgets(self):
         if self.message_frame: 
             self.message_frame.destroy()
             self.message_frame = None
 
-        self.bat_files = sorted([file for file in os.listdir(self.bat_files_folder) if file.endswith((".bat", ".lnk"))])
+        self.footer_label.config(text=f"Total Scripts and Links: {len(self.bat_files)} | App Version: {self.app_version} | Build: {self.build_date}")
+
+        if self.catalog_pending:
+            self.section_files = group_sections(self.bat_files, self.roots.get_section)
+        else:
+            with self.spans.span("catalog_update"):
+                self.catalog.update(self.bat_files_folder, self.bat_files)
+                self.section_files = self.catalog.get_section_files()
+            self.index_contents()
+        self.update_layout()
 
         if not self.bat_files:
             self.display_empty_list_message()
             return
 
-        self.sections = {}
-        section_row = 0
-        section_column = 0
-
-        for file_name in self.bat_files:
-            if '-' in file_name:
-                section_name = file_name.split('-')[0]
-            else:
-                section_name = "#no_section"
-
-            if section_name not in self.sections:
-                self.sections[section_name] = self.create_section_frame(section_name, section_row, section_column)
-                section_column += 1
-                if section_column >= self.max_sections_per_row:
-                    section_column = 0
-                    section_row += 1
-
-            if not self.search_keyword or self.search_keyword in file_name.lower():
-                file_path = os.path.join(self.bat_files_folder, file_name)
-                button_frame = tk.Frame(self.sections[section_name])
-                button_frame.pack(padx=10, pady=2, fill=tk.X)
-
-                self.create_button(button_frame, file_name, partial(self.run_bat, file_path))
-
-                # rename_button = tk.Button(button_frame, image=self.rename_icon, command=partial(self.rename_script, file_path))
-                # rename_button.pack(side=tk.LEFT)
-                # Tooltip(rename_button, "Rename script")
-
-                run_as_admin_button = tk.Button(button_frame, image=self.admin_icon, command=partial(self.run_bat_as_admin, file_path))
-                run_as_admin_button.pack(side=tk.LEFT)
-                Tooltip(run_as_admin_button, "Run script with elevated rights")
-
-                # edit_button = tk.Button(button_frame, image=self.edit_icon, command=partial(self.edit_script, file_path))
-                # edit_button.pack(side=tk.RIGHT)
-                #  # Create a tooltip for the Edit button
-                # Tooltip(edit_button, "Edit script")
-
-                # delete_button = tk.Button(button_frame, image=self.trash_icon, command=partial(self.delete_script, file_path))
-                # delete_button.image = self.trash_icon  # Keep a reference
-                # delete_button.pack(side='left')
-                # Tooltip(delete_button, "Move script to trash")
-
+        if self.prefetch_previews_enabled:
+            self.prefetch_previews()
+
+    def apply_search_filter(self):
+        # Searching only changes the layout, the rows on screen are recycled for the matches
+        self.update_layout()
+
+    def update_layout(self):
+        # Positions of every section and row, computed without touching any widget. Sections are
+        # placed in grid rows of max_sections_per_row, each as tall as its longest section.
+        matches = None
+        if self.search_keyword and self.catalog_pending:
+            # Plain name match over the snapshot until the index is ready
+            matches = {file_name for file_name in self.bat_files if self.search_keyword in os.path.basename(file_name).lower()}
+        elif self.search_keyword:
+            matches = self.catalog.find(self.search_keyword, search_contents=self.search_contents, fuzzy=self.fuzzy_search)
+        sections = []
+        for section_name, files in self.section_files.items():
+            visible_files = files if matches is None else [file_name for file_name in files if file_name in matches]
+            if visible_files or matches is None:
+                sections.append((section_name, visible_files))
+
+        self.grid_rows = []  # (top, height, [(section name, column, files)])
+        top = SECTION_PADDING
+        for start in range(0, len(sections), self.max_sections_per_row):
+            row_sections = [(section_name, column, files) for column, (section_name, files) in enumerate(sections[start:start + self.max_sections_per_row])]
+            height = self.section_header_height + max(len(files) for _, _, files in row_sections) * self.row_height + SECTION_PADDING
+            self.grid_rows.append((top, height, row_sections))
+            top += height + SECTION_PADDING
+        self.grid_row_tops = [grid_row[0] for grid_row in self.grid_rows]
+
+        width = SECTION_PADDING + self.max_sections_per_row * (self.column_width + SECTION_PADDING)
+        height = min(top, self.root.winfo_screenheight() - 200)
+        self.canvas.config(scrollregion=(0, 0, width, top), width=width, height=height)
+        self.render_visible()
+
+    def render_visible(self):
+        with self.spans.span("render_visible"):
+            self.render_visible_rows()
+
+    def render_visible_rows(self):
+        # Materialize only the sections and rows inside the viewport, recycling a pool of rows
+        view_top = self.canvas.canvasy(0)
+        view_bottom = view_top + max(self.canvas.winfo_height(), int(self.canvas.cget("height")))
+        self.canvas.delete("section")
+
+        visible = {}  # file name -> (x, y)
+        first_grid_row = max(0, bisect.bisect_right(self.grid_row_tops, view_top) - 1)
+        for top, height, row_sections in self.grid_rows[first_grid_row:]:
+            if top > view_bottom:
+                break
+            for section_name, column, files in row_sections:
+                x = SECTION_PADDING + column * (self.column_width + SECTION_PADDING)
+                self.draw_section(section_name, x, top, height)
+                rows_top = top + self.section_header_height
+                first_row = max(0, int((view_top - rows_top) // self.row_height))
+                last_row = min(len(files), int((view_bottom - rows_top) // self.row_height) + 1)
+                for index in range(first_row, last_row):
+                    visible[files[index]] = (x + 10, rows_top + index * self.row_height)
+
+        for file_name in [file_name for file_name in self.script_rows if file_name not in visible]:
+            row = self.script_rows.pop(file_name)
+            self.canvas.itemconfigure(row.window, state="hidden")
+            self.free_rows.append(row)
+
+        created_rows = 0
+        for file_name, position in visible.items():
+            row = self.script_rows.get(file_name)
+            if row is None:
+                if not self.free_rows:
+                    # Grow the pool a batch at a time so the window keeps painting while it fills up
+                    if created_rows == ROW_CREATE_BATCH:
+                        self.schedule_render()
+                        return
+                    created_rows += 1
+                if self.free_rows:
+                    row = self.free_rows.pop()
+                    self.widget_stats["recycled"] += 1
+                else:
+                    row = self.create_script_row()
+                row.file_name = file_name
+                row.button.config(text=self.get_button_text(file_name))
+                self.update_row_selection(row)
+                self.canvas.itemconfigure(row.window, state="normal")
+                self.script_rows[file_name] = row
+            if row.position != position:
+                self.canvas.coords(row.window, *position)
+                row.position = position
+
+        if (self.catalog_loaded or self.from_snapshot) and not self.profiler.finished:
+            self.profiler.mark("rows populated")
+            self.profiler.report()
+
+    def get_button_text(self, file_name):
+        file_path = os.path.abspath(os.path.join(self.bat_files_folder, file_name))
+        favorite = self.settings.get_script_value(file_path, "favorite", False)
+        return ("\u2605 " if favorite else "") + os.path.basename(file_name)
+
+    def toggle_favorite(self, file_name):
+        file_path = os.path.abspath(os.path.join(self.bat_files_folder, file_name))
+        self.settings.set_script_value(file_path, "favorite", self.favorite_var.get())
+        if file_name in self.script_rows:
+            self.script_rows[file_name].button.config(text=self.get_button_text(file_name))
+
+    def schedule_render(self):
+        if not self.render_after_id:
+            self.render_after_id = self.root.after(1, self.deferred_render)
+
+    def deferred_render(self):
+        self.render_after_id = None
+        self.render_visible()
+
+    def draw_section(self, section_name, x, top, height):
+        # Section frames are canvas items, drawn like a LabelFrame with the title on the border
+        border_top = top + self.section_header_height // 2
+        border = self.canvas.create_rectangle(x, border_top, x + self.column_width, top + height, outline="gray", tags="section")
+        title = self.canvas.create_text(x + 10, border_top, text=section_name, anchor=tk.W, font=("Arial", 12, "bold"), tags="section")
+        title_background = self.canvas.create_rectangle(self.canvas.bbox(title), fill=self.canvas.cget("background"), outline="", tags="section")
+        self.canvas.tag_raise(title)
+        # Right-clicking the section offers to run or select all of its scripts
+        for item in (border, title, title_background):
+            self.canvas.tag_bind(item, "<Button-3>", lambda event: self.post_section_menu(event, section_name))
+
+    def create_script_row(self):
+        with self.spans.span("create_script_row"):
+            return self.build_script_row()
+
+    def build_script_row(self):
+        button_frame = tk.Frame(self.canvas)
+        row = ScriptRow(button_frame)
+
+        row.button = self.create_button(button_frame, row)
+
+        # rename_button = tk.Button(button_frame, image=self.rename_icon, command=partial(self.rename_script, file_path))
+        # rename_button.pack(side=tk.LEFT)
+        # Tooltip(rename_button, "Rename script")
+
+        run_as_admin_button = tk.Button(button_frame, image=self.admin_icon, command=lambda: self.run_bat_as_admin(os.path.join(self.bat_files_folder, row.file_name)))
+        run_as_admin_button.image = self.admin_icon  # Keep a reference, rows outlive a reload of the icons
+        run_as_admin_button.pack(side=tk.LEFT)
+        Tooltip(run_as_admin_button, "Run script with elevated rights")
+
+        # edit_button = tk.Button(button_frame, image=self.edit_icon, command=partial(self.edit_script, file_path))
+        # edit_button.pack(side=tk.RIGHT)
+        #  # Create a tooltip for the Edit button
+        # Tooltip(edit_button, "Edit script")
+
+        # delete_button = tk.Button(button_frame, image=self.trash_icon, command=partial(self.delete_script, file_path))
+        # delete_button.image = self.trash_icon  # Keep a reference
+        # delete_button.pack(side='left')
+        # Tooltip(delete_button, "Move script to trash")
+
+        for widget in (button_frame, row.button, run_as_admin_button):
+            self.bind_mousewheel(widget)
+        row.window = self.canvas.create_window(0, 0, window=button_frame, anchor=tk.NW, state="hidden")
+        self.widget_stats["created"] += 1 + self.count_descendants(button_frame)
+        return row
+
+    def count_descendants(self, widget):
+        children = widget.winfo_children()
+        return len(children) + sum(self.count_descendants(child) for child in children)
+
+    def measure_script_row(self):
+        # Row height and column width come from a real row, so fonts and HiDPI scaling are respected
+        if not self.free_rows and not self.script_rows:
+            self.free_rows.append(self.create_script_row())
+        rows = self.free_rows + list(self.script_rows.values())
+        for row in rows:
+            row.button.config(width=self.max_button_width - 10)
+        rows[0].frame.update_idletasks()
+        self.row_height = rows[0].frame.winfo_reqheight() + ROW_PADDING
+        self.column_width = rows[0].frame.winfo_reqwidth() + 20
+
+    def scroll_canvas(self, *args):
+        self.canvas.yview(*args)
+        self.render_visible()
+
+    def bind_mousewheel(self, widget):
+        widget.bind("<MouseWheel>", self.on_mousewheel)
+        widget.bind("<Button-4>", self.on_mousewheel)
+        widget.bind("<Button-5>", self.on_mousewheel)
+
+    def on_mousewheel(self, event):
+        if event.num == 4 or event.delta > 0:
+            self.scroll_canvas("scroll", -1, "units")
+        else:
+            self.scroll_canvas("scroll", 1, "units")
 
     def rename_script(self, old_path):
         old_name = os.path.basename(old_path)
@@ -279,7 +2253,7 @@ class BatFileRunner:
                 new_name += old_extension
             
             if new_name != old_name:
-                new_path = os.path.join(self.bat_files_folder, new_name)
+                new_path = os.path.join(os.path.dirname(old_path), new_name)
                 
                 # Validate old_path exists before attempting to rename
                 if not os.path.exists(old_path):
@@ -287,8 +2261,12 @@ class BatFileRunner:
                     return
                 
                 try:
-                    os.rename(old_path, new_path)
-                    self.refresh_ui()
+                    with self.spans.span("rename_script"):
+                        os.rename(old_path, new_path)
+                        self.settings.rename_script(os.path.abspath(old_path), os.path.abspath(new_path))
+                        if self.roots.get_key(old_path) in self.frecency:
+                            self.frecency[self.roots.get_key(new_path)] = self.frecency.pop(self.roots.get_key(old_path))
+                        self.apply_folder_events([("renamed", self.roots.get_key(old_path), self.roots.get_key(new_path))])
                 except PermissionError as e:
                     messagebox.showerror("Error", "The file is currently open or in use. Please close it and try again.")
                 except FileNotFoundError as e:
@@ -296,8 +2274,6 @@ class BatFileRunner:
                 except Exception as e:
                     messagebox.showerror("Error", f"An unexpected error occurred: {str(e)}")
 
-                self.refresh_ui()
-
     def delete_script(self, file_path):
         # Normalize the file path
         normalized_path = os.path.normpath(file_path)
@@ -308,8 +2284,12 @@ class BatFileRunner:
             return
 
         if messagebox.askokcancel("Delete Script", f"Are you sure you want to delete {os.path.basename(file_path)}?", icon='warning'):
-            send2trash.send2trash(normalized_path)
-            self.refresh_ui()
+            with self.spans.span("delete_script"):
+                import send2trash
+                send2trash.send2trash(normalized_path)
+                self.settings.remove_script(os.path.abspath(normalized_path))
+                self.frecency.pop(self.roots.get_key(normalized_path), None)
+                self.apply_folder_events([("removed", self.roots.get_key(normalized_path))])
 
     def display_empty_list_message(self):
         if self.message_frame: 
@@ -321,13 +2301,10 @@ class BatFileRunner:
         message_label = tk.Label(self.message_frame, text="The list is empty, please select a script folder using the top bar menu", font=("Arial", 12))
         message_label.pack(side=tk.TOP, expand=True)
 
-    def create_section_frame(self, section_name, row, column):
-        section_frame = tk.LabelFrame(self.main_frame, text=section_name, font=("Arial", 12, "bold"))
-        section_frame.grid(row=row, column=column, padx=10, pady=5, sticky="nsew")
-        return section_frame
-
     def setup_ui(self):
-        self.root.resizable(False, False)
+        self.root.resizable(False, True)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.root.bind_all("<Control-p>", self.show_quick_launcher)
 
         self.top_frame = tk.Frame(self.root)
         self.top_frame.pack(side=tk.TOP, fill=tk.X, expand=True)
@@ -364,6 +2341,21 @@ class BatFileRunner:
         settings_menu.add_command(label="Set Default Folder", command=self.set_default_folder)
         settings_menu.add_command(label="Set Max Sections Per Row", command=self.set_max_sections_per_row)
         settings_menu.add_checkbutton(label="Skip Validation", variable=self.skip_validation, command=self.toggle_skip_validation)
+        settings_menu.add_checkbutton(label="Search Script Contents", command=self.toggle_search_contents)
+        settings_menu.add_checkbutton(label="Fuzzy Search", command=self.toggle_fuzzy_search)
+        settings_menu.add_command(label="Set Max Concurrent Runs", command=self.set_max_concurrent_runs)
+        self.capture_output_var = tk.BooleanVar(value=self.capture_output)
+        settings_menu.add_checkbutton(label="Capture Script Output", variable=self.capture_output_var, command=self.toggle_capture_output)
+        self.watch_folder_var = tk.BooleanVar(value=self.watch_folder)
+        settings_menu.add_checkbutton(label="Watch Folder for Changes", variable=self.watch_folder_var, command=self.toggle_watch_folder)
+
+        run_menu = tk.Menu(menu_bar, tearoff=0)
+        menu_bar.add_cascade(label="Run", menu=run_menu)
+        run_menu.add_command(label="Quick Launch", accelerator="Ctrl+P", command=self.show_quick_launcher)
+        run_menu.add_command(label="Run Selected", command=self.run_selected)
+        run_menu.add_command(label="Clear Selection", command=self.clear_selection)
+        self.stop_batch_on_failure = tk.BooleanVar(value=True)
+        run_menu.add_checkbutton(label="Stop Batch on Failure", variable=self.stop_batch_on_failure)
 
         menu_bar.add_command(label="Refresh", command=self.refresh_ui)
 
@@ -371,25 +2363,280 @@ class BatFileRunner:
         about_menu = tk.Menu(menu_bar, tearoff=0)
         menu_bar.add_cascade(label="About", menu=about_menu)
         about_menu.add_command(label="About Script Runner", command=self.show_about_window)
+        about_menu.add_command(label="Diagnostics", command=self.show_diagnostics_window)
 
         self.main_frame = tk.Frame(self.root)
         self.main_frame.pack(fill=tk.BOTH, expand=True)
 
-        if not os.listdir(self.bat_files_folder):
-            self.set_default_folder()
+        # Scrollable grid, only the rows in view exist as widgets
+        self.scrollbar = tk.Scrollbar(self.main_frame, orient=tk.VERTICAL, command=self.scroll_canvas)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas = tk.Canvas(self.main_frame, highlightthickness=0, yscrollcommand=self.scrollbar.set, yscrollincrement=ROW_PADDING * 5)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.canvas.bind("<Configure>", lambda event: self.render_visible())
+        self.bind_mousewheel(self.canvas)
 
-        self.bat_files = sorted([file for file in os.listdir(self.bat_files_folder) if file.endswith((".bat", ".lnk"))])
-
-        if self.bat_files:
-            self.max_button_width = max(len(file_name) for file_name in self.bat_files)
-        else:
-            self.max_button_width = 30  # Default width in case there are no files
+        self.max_button_width = 30  # Default width until the scripts are listed
 
         # Footer for statistics including version and build date
-        self.footer_label = tk.Label(self.root, text=f"Version: {self.app_version} | Build: {self.build_date}")
+        self.footer_label = tk.Label(self.root, text=f"Loading scripts... | Version: {self.app_version} | Build: {self.build_date}")
         self.footer_label.pack(side=tk.BOTTOM, fill=tk.X)
 
-        self.refresh_ui()
+        self.create_log_pane()
+
+        self.root.iconphoto(True, self.icons.get("icon"))
+        self.load_icons()
+        self.create_script_menu()
+        self.create_section_menu()
+        self.measure_script_row()
+        self.process_run_events()
+        self.profiler.mark("window")
+
+        self.load_snapshot()
+
+        # The folder may be a slow network share, list and index it without blocking the window
+        threading.Thread(target=self.load_catalog, args=(self.roots, self.search_contents, list(self.bat_files) if self.from_snapshot else None),
+                         name="CatalogLoader", daemon=True).start()
+        self.root.after(CATALOG_POLL_MS, self.check_catalog_loaded)
+
+    def load_snapshot(self):
+        snapshot = self.catalog_snapshot.load(self.bat_files_folder)
+        if not snapshot or not snapshot[0]:
+            return
+        self.file_states, previews = snapshot
+        self.preview_cache.restore(previews)
+        self.from_snapshot = True
+        self.catalog_pending = True
+        self.show_scripts(sorted(self.file_states))
+        self.profiler.mark("snapshot")
+
+    def load_catalog(self, roots, index_contents, snapshot_files):
+        # Runs on a background thread, builds a separate catalog that the Tk thread adopts when ready.
+        # When the folder cannot be listed, the catalog indexes the scripts of the snapshot, if any.
+        try:
+            with self.spans.span("scan_folders"):
+                files = roots.scan()
+            file_names = sorted(files)
+        except OSError:
+            files, file_names = None, snapshot_files
+        catalog = None
+        if file_names:
+            with self.spans.span("catalog_update"):
+                catalog = ScriptCatalog(roots.get_section)
+                catalog.index_contents = index_contents
+                catalog.update(roots.main.path, file_names)
+                catalog.index_stale_contents()
+        self.catalog_results.put((roots, files, catalog))
+
+    def check_catalog_loaded(self):
+        try:
+            roots, files, catalog = self.catalog_results.get_nowait()
+        except queue.Empty:
+            self.root.after(CATALOG_POLL_MS, self.check_catalog_loaded)
+            return
+        self.profiler.mark("catalog loaded")
+        self.catalog_loaded = True
+        if roots is not self.roots:
+            return  # Another folder was picked meanwhile and refreshed synchronously
+        self.catalog_pending = False
+        if catalog is not None:
+            if catalog.index_contents != self.search_contents:
+                catalog.set_index_contents(self.search_contents)  # Toggled while loading
+            self.catalog = catalog
+            self.index_contents()
+        if files is None and self.from_snapshot:
+            # The share is unreachable, keep showing what it held last time
+            self.update_layout()
+            self.footer_label.config(text=f"Folder unavailable, showing {len(self.bat_files)} scripts from the last session | App Version: {self.app_version} | Build: {self.build_date}")
+            return
+        if not files:
+            self.set_default_folder()
+            if self.roots is roots:
+                self.file_states = {}
+                self.bat_files = []
+                self.update_script_widgets()
+            return
+
+        if self.from_snapshot:
+            self.reconcile_snapshot(files)
+        else:
+            self.file_states = files
+            self.show_scripts(sorted(files))
+        if self.watch_folder:
+            self.start_watcher()
+
+    def show_scripts(self, bat_files):
+        self.bat_files = bat_files
+        self.max_button_width = max(len(os.path.basename(file_name)) for file_name in self.bat_files)
+        self.measure_script_row()
+        self.update_script_widgets()
+
+    def reconcile_snapshot(self, files):
+        # Only the differences between the snapshot and the folder touch the grid
+        events = [("removed", file_name) for file_name in self.file_states if file_name not in files]
+        for file_name, state in files.items():
+            if file_name not in self.file_states:
+                events.append(("added", file_name))
+            elif self.file_states[file_name] != state:
+                events.append(("modified", file_name))
+        self.file_states = files
+        self.from_snapshot = False
+        self.apply_folder_events(events)
+
+    def save_snapshot(self):
+        if not self.catalog_loaded or self.from_snapshot:
+            return  # The folder was never listed, the old snapshot is still the best one
+        # Scripts added during the session have no known state, the next start reconciles them
+        files = {file_name: self.file_states.get(file_name, [0, 0]) for file_name in self.bat_files}
+        try:
+            self.catalog_snapshot.save(self.bat_files_folder, files, self.preview_cache.export())
+        except OSError:
+            pass
+
+    def create_log_pane(self):
+        # Output of the scripts started from the app, fed by ExecutionEngine events
+        log_frame = tk.Frame(self.root)
+        log_frame.pack(side=tk.BOTTOM, fill=tk.X)
+
+        status_frame = tk.Frame(log_frame)
+        status_frame.pack(side=tk.TOP, fill=tk.X)
+        self.run_status_label = tk.Label(status_frame, text="Running: 0 | Queued: 0", anchor=tk.W)
+        self.run_status_label.pack(side=tk.LEFT, padx=5)
+        tk.Button(status_frame, text="Clear Log", command=lambda: self.log_text.delete("1.0", tk.END)).pack(side=tk.RIGHT)
+        self.stop_button = tk.Button(status_frame, text="Stop...", command=self.post_stop_menu)
+        self.stop_button.pack(side=tk.RIGHT)
+        self.stop_menu = tk.Menu(self.root, tearoff=0)
+
+        log_scrollbar = tk.Scrollbar(log_frame, orient=tk.VERTICAL)
+        log_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.log_text = tk.Text(log_frame, height=LOG_PANE_HEIGHT, wrap=tk.NONE, yscrollcommand=log_scrollbar.set)
+        self.log_text.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        log_scrollbar.config(command=self.log_text.yview)
+
+    def process_run_events(self):
+        # Drain what the reader threads produced since the last tick, the Tk thread never blocks on a pipe
+        lines = []
+        for _ in range(RUN_EVENTS_BATCH):
+            try:
+                event = self.engine.events.get_nowait()
+            except queue.Empty:
+                break
+            kind, run = event[0], event[1]
+            if kind == "batch_finished":
+                lines.append(f"[{run.name}] {run.get_summary()}\n")
+            elif kind == "started":
+                lines.append(f"[{run.name}] started\n")
+            elif kind == "output":
+                lines.append("".join(f"[{run.name}] {line}\n" for line in event[2].splitlines()))
+            elif kind == "finished":
+                self.history.record(run)
+                lines.append(f"[{run.name}] exited with code {run.exit_code} after {run.get_duration():.1f}s\n")
+        if lines:
+            self.append_log("".join(lines))
+        running, queued = self.engine.get_counts()
+        self.run_status_label.config(text=f"Running: {running} | Queued: {queued}")
+        self.root.after(RUN_EVENTS_POLL_MS, self.process_run_events)
+
+    def post_stop_menu(self):
+        # Captured scripts run without a window, this is the only way to stop one from the app
+        self.stop_menu.delete(0, tk.END)
+        runs = self.engine.get_runs()
+        for run in runs:
+            self.stop_menu.add_command(label=f"Stop {run.name} ({run.state})", command=partial(self.engine.cancel, run))
+        if runs:
+            self.stop_menu.add_separator()
+            self.stop_menu.add_command(label="Stop All", command=self.engine.cancel_all)
+        else:
+            self.stop_menu.add_command(label="No scripts running", state=tk.DISABLED)
+        self.stop_menu.post(self.stop_button.winfo_rootx(), self.stop_button.winfo_rooty() + self.stop_button.winfo_height())
+
+    def append_log(self, text):
+        at_end = self.log_text.yview()[1] >= 1.0
+        self.log_text.insert(tk.END, text)
+        line_count = int(self.log_text.index("end-1c").split(".")[0])
+        if line_count > LOG_MAX_LINES:
+            self.log_text.delete("1.0", f"{line_count - LOG_MAX_LINES}.0")
+        if at_end:
+            self.log_text.see(tk.END)
+
+    def on_close(self):
+        running, queued = self.engine.get_counts()
+        if running or queued:
+            if not messagebox.askokcancel("Scripts Running", f"{running + queued} scripts are still running or queued and will be stopped. Close anyway?", icon="warning"):
+                return
+            self.engine.cancel_all()
+        self.stop_watcher()
+        self.shortcuts.save()
+        self.save_snapshot()
+        self.history.close()
+        self.settings.close()
+        self.root.destroy()
+
+    def start_watcher(self):
+        self.stop_watcher()
+        self.watchers = [FolderWatcher(root, self.watch_events) for root in self.roots.roots]
+        for watcher in self.watchers:
+            watcher.start()
+        self.process_watch_events()
+
+    def stop_watcher(self):
+        for watcher in self.watchers:
+            watcher.stop()
+        self.watchers = []
+        if self.watch_after_id:
+            self.root.after_cancel(self.watch_after_id)
+            self.watch_after_id = None
+        # Drop the events of the previous folder
+        while not self.watch_events.empty():
+            self.watch_events.get_nowait()
+
+    def toggle_watch_folder(self):
+        self.watch_folder = not self.watch_folder
+        self.settings.set("Settings", "watch_folder", self.watch_folder)
+        if self.watch_folder:
+            self.refresh_ui()  # Catch up with whatever changed while the folder was not watched
+            self.start_watcher()
+        else:
+            self.stop_watcher()
+
+    def process_watch_events(self):
+        # Runs on the Tk thread, the watcher thread only ever puts events on the queue
+        events = []
+        while not self.watch_events.empty():
+            events.append(self.watch_events.get_nowait())
+        if events:
+            self.apply_folder_events(events)
+        self.watch_after_id = self.root.after(WATCH_QUEUE_POLL_MS, self.process_watch_events)
+
+    def apply_folder_events(self, events):
+        # Applying an event twice is harmless, so operations done in the app can update the model
+        # right away and the watcher may still report the same change later
+        bat_files = set(self.bat_files)
+        for event in events:
+            kind, file_name = event[0], event[1]
+            # Saving through a temporary file renamed over the script only reports "added"
+            self.preview_cache.invalidate(os.path.join(self.bat_files_folder, file_name))
+            if kind == "renamed":
+                self.preview_cache.invalidate(os.path.join(self.bat_files_folder, event[2]))
+            if kind == "added":
+                if self.roots.accepts(file_name):
+                    bat_files.add(file_name)
+            elif kind == "removed":
+                bat_files.discard(file_name)
+            elif kind == "renamed":
+                bat_files.discard(file_name)
+                if self.roots.accepts(event[2]):
+                    bat_files.add(event[2])
+            # The content search reads the script again, an "added" may replace a listed script
+            self.catalog.mark_modified(event[2] if kind == "renamed" else file_name)
+        if bat_files != set(self.bat_files):
+            self.bat_files = sorted(bat_files)
+            self.update_script_widgets()
+        self.index_contents()
+
+    def prefetch_previews(self):
+        paths = [os.path.join(self.bat_files_folder, file_name) for file_name in self.bat_files if file_name.endswith(RUNNABLE_EXTENSIONS)]
+        self.preview_cache.prefetch(paths)
 
     def open_scripts_folder(self):
         # Get the absolute path of the scripts folder defined in settings
@@ -404,11 +2651,12 @@ class BatFileRunner:
             if not new_script_name.endswith(".bat"):
                 new_script_name += ".bat"
             new_script_path = os.path.join(self.bat_files_folder, new_script_name)
-            # Create the new script file
-            with open(new_script_path, 'w') as new_file:
-                new_file.write("@echo off\n")
-            # Refresh the UI to display the new script
-            self.refresh_ui()
+            with self.spans.span("create_new_script"):
+                # Create the new script file
+                with open(new_script_path, 'w') as new_file:
+                    new_file.write("@echo off\n")
+                # Show the new script right away, without waiting for the folder watcher
+                self.apply_folder_events([("added", new_script_name)])
 
             # Ask if the user wants to edit the new script
             if messagebox.askyesno("Edit Script", "Do you want to edit the new script?"):
@@ -423,6 +2671,180 @@ class BatFileRunner:
         version_label = tk.Label(about_window, text=f"Script Runner Version {self.app_version}\nPython Version {sys.version}")
         version_label.pack(padx=20, pady=20)
 
+    def show_diagnostics_window(self):
+        if self.diagnostics_window is None or not self.diagnostics_window.window.winfo_exists():
+            self.diagnostics_window = DiagnosticsWindow(self)
+        self.diagnostics_window.show()
+
+    def toggle_record_timings(self, enabled):
+        self.spans.enabled = enabled
+        self.settings.set("Settings", "record_timings", enabled)
+
+class ScriptRow:
+    def __init__(self, frame):
+        self.frame = frame
+        self.button = None
+        self.window = None  # Canvas window item showing the frame
+        self.file_name = None
+        self.position = None
+
+class QuickLauncher:
+    # Keyboard-only palette: type, pick with the arrows, Enter runs. The window is built once and
+    # hidden between uses, so neither opening it nor launching creates any widget.
+    def __init__(self, app):
+        self.app = app
+        self.matches = []
+        self.update_after_id = None
+        self.latencies = deque(maxlen=QUICK_LAUNCH_SAMPLES)  # Key press to running process, in ms
+
+        self.window = tk.Toplevel(app.root)
+        self.window.title("Quick Launch")
+        self.window.transient(app.root)
+        self.window.withdraw()
+        self.window.protocol("WM_DELETE_WINDOW", self.hide)
+
+        self.query = tk.StringVar()
+        self.entry = tk.Entry(self.window, width=60, textvariable=self.query)
+        self.entry.pack(fill=tk.X, padx=5, pady=5)
+        self.listbox = tk.Listbox(self.window, height=QUICK_LAUNCH_RESULTS, activestyle=tk.NONE)
+        self.listbox.pack(fill=tk.BOTH, expand=True, padx=5)
+        self.status_label = tk.Label(self.window, text="Enter runs the selected script, Esc closes", anchor=tk.W)
+        self.status_label.pack(fill=tk.X, padx=5)
+
+        self.query.trace_add("write", lambda *args: self.schedule_update())
+        self.entry.bind("<Return>", self.launch)
+        self.entry.bind("<Escape>", lambda event: self.hide())
+        self.entry.bind("<Down>", lambda event: self.move_selection(1))
+        self.entry.bind("<Up>", lambda event: self.move_selection(-1))
+        self.listbox.bind("<Double-Button-1>", self.launch)
+
+    def show(self):
+        self.query.set("")
+        self.update_matches()
+        self.window.deiconify()
+        self.window.lift()
+        self.entry.focus_set()
+
+    def hide(self):
+        self.window.withdraw()
+
+    def schedule_update(self):
+        # Debounced like the main search, Enter applies a pending update before launching
+        if self.update_after_id:
+            self.window.after_cancel(self.update_after_id)
+        self.update_after_id = self.window.after(SEARCH_DEBOUNCE_MS, self.update_matches)
+
+    def update_matches(self):
+        if self.update_after_id:
+            self.window.after_cancel(self.update_after_id)
+            self.update_after_id = None
+        self.matches = self.app.rank_scripts(self.query.get())
+        self.listbox.delete(0, tk.END)
+        for file_name in self.matches:
+            self.listbox.insert(tk.END, self.app.get_button_text(file_name))
+        if self.matches:
+            self.listbox.selection_set(0)
+
+    def move_selection(self, step):
+        selection = self.listbox.curselection()
+        if self.matches:
+            index = min(max((selection[0] if selection else 0) + step, 0), len(self.matches) - 1)
+            self.listbox.selection_clear(0, tk.END)
+            self.listbox.selection_set(index)
+            self.listbox.see(index)
+        return "break"
+
+    def launch(self, event=None):
+        started_at = time.perf_counter()
+        if self.update_after_id:
+            self.update_matches()
+        selection = self.listbox.curselection()
+        if not selection:
+            return "break"
+        file_name = self.matches[selection[0]]
+        self.hide()
+        # Enter is the confirmation, so this skips the dialog of run_bat
+        run = self.app.start_script(os.path.join(self.app.bat_files_folder, file_name))
+        # Queued runs wait for a free slot and shortcuts are opened by the shell, neither is measured
+        if run is not None and run.process is not None:
+            latency_ms = (time.perf_counter() - started_at) * 1000
+            self.latencies.append(latency_ms)
+            median_ms = sorted(self.latencies)[len(self.latencies) // 2]
+            self.status_label.config(text=f"Last launch: {latency_ms:.1f} ms | Median of the last {len(self.latencies)}: {median_ms:.1f} ms")
+            if latency_ms > QUICK_LAUNCH_BUDGET_MS:
+                self.app.append_log(f"[Quick Launch] {os.path.basename(file_name)} took {latency_ms:.0f} ms to start\n")
+        return "break"
+
+
+class DiagnosticsWindow:
+    # Table of the recorded timing spans, refreshed while the window is open
+    def __init__(self, app):
+        self.app = app
+        self.update_after_id = None
+        self.export_note = ""
+
+        self.window = tk.Toplevel(app.root)
+        self.window.title("Diagnostics")
+        self.window.protocol("WM_DELETE_WINDOW", self.hide)
+
+        controls = tk.Frame(self.window)
+        controls.pack(fill=tk.X, padx=5, pady=5)
+        self.record_var = tk.BooleanVar(value=app.spans.enabled)
+        tk.Checkbutton(controls, text="Record timings", variable=self.record_var,
+                       command=lambda: app.toggle_record_timings(self.record_var.get())).pack(side=tk.LEFT)
+        tk.Button(controls, text="Export Trace...", command=self.export_trace).pack(side=tk.RIGHT)
+        tk.Button(controls, text="Clear", command=self.clear).pack(side=tk.RIGHT)
+
+        self.table = tk.Text(self.window, width=150, height=20, wrap=tk.NONE, font=("Courier", 9))
+        self.table.pack(fill=tk.BOTH, expand=True, padx=5)
+        self.status_label = tk.Label(self.window, anchor=tk.W)
+        self.status_label.pack(fill=tk.X, padx=5)
+
+    def show(self):
+        self.window.deiconify()
+        self.window.lift()
+        self.update_table()
+
+    def hide(self):
+        if self.update_after_id:
+            self.window.after_cancel(self.update_after_id)
+            self.update_after_id = None
+        self.window.withdraw()
+
+    def update_table(self):
+        if self.update_after_id:
+            self.window.after_cancel(self.update_after_id)
+        buckets = [f"<{limit}" for limit in SPAN_HISTOGRAM_BUCKETS_MS] + [f">{SPAN_HISTOGRAM_BUCKETS_MS[-1]}"]
+        lines = [f"{'span':<26}{'count':>8}{'mean':>9}{'p50':>9}{'p95':>9}{'max':>9}  " + "".join(f"{bucket:>7}" for bucket in buckets)]
+        for name, count, mean_ms, p50_ms, p95_ms, max_ms, histogram in self.app.spans.get_stats():
+            lines.append(f"{name:<26}{count:>8}{mean_ms:>9.2f}{p50_ms:>9.2f}{p95_ms:>9.2f}{max_ms:>9.2f}  "
+                         + "".join(f"{bucket_count:>7}" for bucket_count in histogram))
+        self.table.config(state=tk.NORMAL)
+        self.table.delete("1.0", tk.END)
+        self.table.insert(tk.END, "\n".join(lines))
+        self.table.config(state=tk.DISABLED)
+        self.status_label.config(text=f"Times in ms, histogram buckets in ms | {len(self.app.spans.spans)} spans buffered"
+                                      + ("" if self.app.spans.enabled else " | Recording is off") + self.export_note)
+        self.update_after_id = self.window.after(1000, self.update_table)
+
+    def clear(self):
+        self.app.spans.clear()
+        self.update_table()
+
+    def export_trace(self):
+        path = filedialog.asksaveasfilename(parent=self.window, title="Export Trace", defaultextension=".json",
+                                            initialfile="script_runner_trace.json", filetypes=[("Chrome trace", "*.json")])
+        if not path:
+            return
+        try:
+            count = self.app.spans.export_chrome_trace(path)
+        except OSError as e:
+            messagebox.showerror("Error", f"Failed to export the trace: {str(e)}")
+            return
+        self.export_note = f" | Exported {count} spans to {path}, open it in chrome://tracing or ui.perfetto.dev"
+        self.update_table()
+
+
 class Tooltip:
     def __init__(self, widget, text):
         self.widget = widget
@@ -445,6 +2867,246 @@ class Tooltip:
         if self.tooltip:
             self.tooltip.destroy()
 
-if __name__ == "__main__":
-    app = BatFileRunner()
+def get_daemon_address():
+    user = getpass.getuser()
+    if sys.platform == "win32":
+        return rf"\\.\pipe\script_runner-{user}"
+    # The socket accepts commands that run scripts, so it lives where only this user can reach it
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "script_runner.sock")
+    socket_dir = os.path.join(tempfile.gettempdir(), f"script_runner-{user}")
+    os.makedirs(socket_dir, mode=0o700, exist_ok=True)
+    if os.stat(socket_dir).st_uid != os.getuid():
+        raise PermissionError(f"{socket_dir} belongs to another user")
+    os.chmod(socket_dir, 0o700)
+    return os.path.join(socket_dir, "daemon.sock")
+
+
+def send_daemon_request(request, address=None):
+    from multiprocessing.connection import Client
+    with Client(address or get_daemon_address()) as connection:
+        connection.send_bytes(json.dumps(request).encode("utf-8"))
+        return json.loads(connection.recv_bytes().decode("utf-8"))
+
+
+class HeadlessRunner:
+    # The script folder without any UI: catalog, shortcut resolution, execution and history.
+    # Used by --list and --run, and kept alive by --serve.
+    def __init__(self, roots):
+        self.roots = roots
+        self.folder = roots.main.path
+        self.catalog = ScriptCatalog(roots.get_section)
+        self.catalog.update(self.folder, sorted(roots.scan()))
+        self.shortcuts = ShortcutResolver(get_config_path(SHORTCUT_CACHE_FILE))
+        self.preview_cache = PreviewCache()
+        self.engine = None
+        self.history = None
+        self.lock = threading.Lock()  # The daemon updates the catalog from its watcher thread
+
+    def start_engine(self, max_concurrent=MAX_CONCURRENT_RUNS):
+        self.engine = ExecutionEngine(max_concurrent)
+        self.history = RunHistory(get_config_path(HISTORY_FILE))
+
+    def list_scripts(self, search=None, limit=None):
+        with self.lock:
+            if search:
+                return self.catalog.search(search, fuzzy=True, limit=limit)
+            return sorted(self.catalog.names)[:limit]
+
+    def find_script(self, name):
+        # Key, file name, or the file name without its extension
+        with self.lock:
+            file_name = match_script_name(name, self.catalog.names)
+            return file_name if file_name in self.catalog.names else None
+
+    def get_run_path(self, file_name):
+        file_path = os.path.join(self.folder, file_name)
+        if not file_path.endswith(".lnk"):
+            return file_path
+        try:
+            target_path = self.shortcuts.resolve(file_path)
+        except Exception:
+            return None  # Unreadable shortcut, reported as a target that is not a script
+        if target_path and os.path.exists(target_path) and target_path.endswith(RUNNABLE_EXTENSIONS):
+            return target_path
+        return None
+
+    def start_runs(self, names, stop_on_failure=True):
+        # One script runs on its own, several go through RunScheduler with their header dependencies
+        scripts = {}
+        for name in names:
+            file_name = self.find_script(name)
+            if file_name is None:
+                raise ValueError(f"No script named {name}")
+            run_path = self.get_run_path(file_name)
+            if run_path is None:
+                raise ValueError(f"The target of {file_name} is not a script")
+            scripts[file_name] = run_path
+        if len(scripts) == 1:
+            return self.engine.submit(next(iter(scripts.values())))
+        scheduler = RunScheduler(self.engine, "Batch", scripts, get_script_dependencies(self.folder, scripts, self.preview_cache), stop_on_failure)
+        scheduler.start()
+        return scheduler
+
+    def handle_event(self, event, output=None):
+        # sys.stdout is looked up per event, it is None in the windowed build
+        output = output or sys.stdout
+        kind, run = event[0], event[1]
+        if kind == "finished":
+            self.history.record(run)
+        if output is None:
+            return
+        if kind == "output":
+            output.write("".join(f"[{run.name}] {line}\n" for line in event[2].splitlines()))
+        elif kind == "finished":
+            output.write(f"[{run.name}] exited with code {run.exit_code} after {run.get_duration():.1f}s\n")
+        elif kind == "batch_finished":
+            output.write(f"[{run.name}] {run.get_summary()}\n")
+        output.flush()
+
+    def run_and_wait(self, names, stop_on_failure=True):
+        started = self.start_runs(names, stop_on_failure)
+        while not (started.done.is_set() and self.engine.events.empty()):
+            try:
+                self.handle_event(self.engine.events.get(timeout=0.1))
+            except queue.Empty:
+                pass
+        self.history.close()
+        if isinstance(started, ScriptRun):
+            return started.exit_code
+        return 0 if all(state == "succeeded" for state in started.results.values()) else 1
+
+
+class ScriptDaemon:
+    # Long-lived local server that keeps the catalog warm and runs scripts on request. Requests
+    # and replies are JSON over a Unix socket, or a named pipe on Windows:
+    #   {"command": "ping"}, {"command": "list", "search": "docker", "limit": 10},
+    #   {"command": "run", "scripts": ["project_1-initialize-docker.bat"]}
+    def __init__(self, runner, address=None):
+        self.runner = runner
+        self.address = address or get_daemon_address()
+        self.watch_events = queue.Queue()
+        self.watchers = [FolderWatcher(root, self.watch_events) for root in runner.roots.roots]
+
+    def serve_forever(self):
+        from multiprocessing.connection import Listener
+        self.runner.start_engine()
+        for watcher in self.watchers:
+            watcher.start()
+        threading.Thread(target=self.pump_events, name="DaemonEvents", daemon=True).start()
+        if sys.platform != "win32" and os.path.exists(self.address):
+            os.remove(self.address)  # Left behind by a daemon that did not shut down cleanly
+        with Listener(self.address) as listener:
+            print(f"Serving {self.runner.folder} on {self.address}", flush=True)
+            while True:
+                try:
+                    connection = listener.accept()
+                except OSError:
+                    continue
+                with connection:
+                    try:
+                        data = connection.recv_bytes()
+                    except (EOFError, OSError):
+                        continue
+                    try:
+                        reply = self.handle_request(json.loads(data.decode("utf-8")))
+                    except (ValueError, KeyError, TypeError) as e:
+                        reply = {"ok": False, "error": str(e)}
+                    except Exception as e:
+                        # One bad request must not take the daemon down with it
+                        reply = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+                    try:
+                        connection.send_bytes(json.dumps(reply).encode("utf-8"))
+                    except (EOFError, OSError):
+                        continue
+
+    def handle_request(self, request):
+        command = request["command"]
+        if command == "ping":
+            return {"ok": True, "folder": self.runner.folder}
+        if command == "list":
+            return {"ok": True, "scripts": self.runner.list_scripts(request.get("search"), request.get("limit"))}
+        if command == "run":
+            started = self.runner.start_runs(request["scripts"], request.get("stop_on_failure", True))
+            if isinstance(started, ScriptRun):
+                return {"ok": True, "run_ids": [started.run_id]}
+            return {"ok": True, "run_ids": [run.run_id for run in started.runs.values() if run is not None]}
+        raise ValueError(f"Unknown command {command}")
+
+    def pump_events(self):
+        # Keeps the catalog in step with the folder and logs the output of the runs
+        while True:
+            while not self.watch_events.empty():
+                event = self.watch_events.get_nowait()
+                catalog = self.runner.catalog
+                with self.runner.lock:
+                    # Events may repeat, e.g. a save reported as added, so each one is applied only if it changes the catalog
+                    if event[0] in ("removed", "renamed") and event[1] in catalog.names:
+                        catalog.remove(event[1])
+                    added = event[2] if event[0] == "renamed" else event[1] if event[0] == "added" else None
+                    if added is not None and added not in catalog.names:
+                        catalog.add(added)
+            try:
+                self.runner.handle_event(self.runner.engine.events.get(timeout=WATCH_QUEUE_POLL_MS / 1000))
+            except queue.Empty:
+                pass
+
+
+def parse_arguments(argv=None):
+    parser = argparse.ArgumentParser(description="Group and run the scripts of a folder. Without options the GUI starts.")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--list", action="store_true", help="print the scripts of the folder")
+    mode.add_argument("--run", nargs="+", metavar="SCRIPT", help="run scripts and wait for them, the extension may be omitted")
+    mode.add_argument("--serve", action="store_true", help="start a local daemon that keeps the catalog warm and runs scripts on request")
+    parser.add_argument("--profile-startup", action="store_true", help="print how long each phase of the GUI start took")
+    parser.add_argument("--search", help="with --list, only print matches ranked by relevance")
+    parser.add_argument("--folder", help="main scripts folder, defaults to bat_files_folder in config.cfg")
+    parser.add_argument("--via-daemon", action="store_true", help="with --list or --run, ask the running daemon instead")
+    parser.add_argument("--keep-going", action="store_true", help="with several scripts, keep running the independent ones after a failure")
+    return parser.parse_args(argv)
+
+
+def run_headless(args):
+    if args.via_daemon:
+        if args.list:
+            reply = send_daemon_request({"command": "list", "search": args.search})
+        else:
+            reply = send_daemon_request({"command": "run", "scripts": args.run, "stop_on_failure": not args.keep_going})
+        if not reply["ok"]:
+            print(reply["error"], file=sys.stderr)
+            return 1
+        print("\n".join(reply["scripts"]) if args.list else f"Started run {', '.join(map(str, reply['run_ids']))}")
+        return 0
+
+    config = Settings(get_config_dir()).config
+    folder = args.folder or config.get("Settings", "bat_files_folder", fallback="")
+    if not folder or not os.path.isdir(folder):
+        print(f"Scripts folder not found: {folder!r}", file=sys.stderr)
+        return 1
+    runner = HeadlessRunner(ScriptRoots.from_config(config, folder))
+    if args.list:
+        print("\n".join(runner.list_scripts(args.search)))
+        return 0
+    if args.run:
+        runner.start_engine()
+        try:
+            return runner.run_and_wait(args.run, not args.keep_going)
+        except ValueError as e:
+            print(str(e), file=sys.stderr)
+            return 1
+    ScriptDaemon(runner).serve_forever()
+    return 0
+
+
+def main(argv=None):
+    args = parse_arguments(argv)
+    if args.list or args.run or args.serve:
+        return run_headless(args)
+    app = BatFileRunner(profile_startup=args.profile_startup)
     app.root.mainloop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
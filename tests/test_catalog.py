@@ -0,0 +1,132 @@
+"""ScriptCatalog name, content and fuzzy search over an in-memory or temporary script folder."""
+import os
+import sys
+import tempfile
+import unittest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import script_runner  # noqa: E402
+
+NAMES = ["docker-build.bat", "docker-clean.bat", "wifi-password.bat", "backup-docker-volumes.bat", "db-restore.lnk"]
+
+
+class ScriptCatalogFindTest(unittest.TestCase):
+    def setUp(self):
+        self.catalog = script_runner.ScriptCatalog()
+        self.catalog.update("/scripts", NAMES)
+
+    def test_empty_query_matches_everything(self):
+        self.assertEqual(self.catalog.find(""), set(NAMES))
+
+    def test_find_names_is_a_case_insensitive_substring_match(self):
+        self.assertEqual(self.catalog.find_names("docker"), {"docker-build.bat", "docker-clean.bat", "backup-docker-volumes.bat"})
+        self.assertEqual(self.catalog.find("DOCKER-B"), {"docker-build.bat"})
+
+    def test_short_queries_match_without_trigrams(self):
+        self.assertEqual(self.catalog.find_names("db"), {"db-restore.lnk"})
+
+    def test_trigrams_must_appear_contiguously(self):
+        # "aba-bab" has both trigrams of "abab" without containing it
+        self.catalog.update("/scripts", NAMES + ["aba-bab.bat", "x-abab.bat"])
+        self.assertEqual(self.catalog.find_names("abab"), {"x-abab.bat"})
+
+    def test_refining_and_widening_the_query(self):
+        self.assertEqual(len(self.catalog.find_names("doc")), 3)
+        self.assertEqual(self.catalog.find_names("dock"), {"docker-build.bat", "docker-clean.bat", "backup-docker-volumes.bat"})
+        self.assertEqual(self.catalog.find_names("docker-c"), {"docker-clean.bat"})
+        # Deleting characters must not keep searching in the narrower matches
+        self.assertEqual(len(self.catalog.find_names("dock")), 3)
+
+    def test_added_and_removed_names_are_searched(self):
+        self.catalog.find_names("dock")
+        self.catalog.update("/scripts", NAMES[1:] + ["docker-deploy.bat"])
+        self.assertEqual(self.catalog.find_names("docker"), {"docker-clean.bat", "backup-docker-volumes.bat", "docker-deploy.bat"})
+
+    def test_switching_folders_during_a_search(self):
+        # The matches of the previous folder used to be refined, which raised KeyError
+        self.catalog.find_names("doc")
+        self.catalog.update("/other", [])
+        self.assertEqual(self.catalog.find_names("dock"), set())
+        self.catalog.update("/scripts", NAMES)
+        self.assertEqual(len(self.catalog.find_names("docke")), 3)
+
+    def test_fuzzy_match_tolerates_typos(self):
+        self.assertIn("wifi-password.bat", self.catalog.find("wifi-pasword", fuzzy=True))
+        self.assertNotIn("wifi-password.bat", self.catalog.find("wifi-pasword"))
+
+    def test_sections(self):
+        self.assertEqual(self.catalog.get_section_files(),
+                         {"backup": ["backup-docker-volumes.bat"], "db": ["db-restore.lnk"],
+                          "docker": ["docker-build.bat", "docker-clean.bat"], "wifi": ["wifi-password.bat"]})
+
+
+class ScriptCatalogSearchTest(unittest.TestCase):
+    def setUp(self):
+        self.catalog = script_runner.ScriptCatalog()
+        self.catalog.update("/scripts", NAMES)
+
+    def test_ranks_prefix_then_word_prefix_then_substring(self):
+        self.catalog.update("/scripts", NAMES + ["undocked.bat"])
+        self.assertEqual(self.catalog.search("dock"),
+                         ["docker-build.bat", "docker-clean.bat", "backup-docker-volumes.bat", "undocked.bat"])
+
+    def test_limit(self):
+        self.assertEqual(self.catalog.search("docker", limit=1), ["docker-build.bat"])
+        self.assertEqual(self.catalog.search("", limit=2), ["backup-docker-volumes.bat", "db-restore.lnk"])
+
+    def test_similar_names_rank_after_name_matches(self):
+        self.assertEqual(self.catalog.search("docker-bild", fuzzy=True)[0], "docker-build.bat")
+
+
+class ScriptCatalogContentsTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.folder = self.temp_dir.name
+        self.write("a-copy.bat", "xcopy C:\\Data D:\\Backup\n")
+        self.write("b-ping.bat", "ping fileserver\n")
+        self.catalog = script_runner.ScriptCatalog()
+        self.catalog.update(self.folder, ["a-copy.bat", "b-ping.bat"])
+
+    def write(self, name, text):
+        with open(os.path.join(self.folder, name), "w") as f:
+            f.write(text)
+
+    def test_contents_are_read_when_indexed(self):
+        self.catalog.set_index_contents(True)
+        self.assertEqual(self.catalog.find("fileserver", search_contents=True), set())
+        self.catalog.index_stale_contents()
+        self.assertEqual(self.catalog.find("fileserver", search_contents=True), {"b-ping.bat"})
+        self.assertEqual(self.catalog.search("xcopy", search_contents=True), ["a-copy.bat"])
+        self.assertEqual(self.catalog.find("fileserver"), set())
+
+    def test_added_and_modified_scripts_are_read_again(self):
+        self.catalog.set_index_contents(True)
+        self.catalog.index_stale_contents()
+        self.write("b-ping.bat", "ping printer\n")
+        self.write("c-new.bat", "ping fileserver\n")
+        self.catalog.mark_modified("b-ping.bat")
+        self.catalog.update(self.folder, ["a-copy.bat", "b-ping.bat", "c-new.bat"])
+        self.assertEqual(self.catalog.stale_contents, {"b-ping.bat", "c-new.bat"})
+        self.catalog.index_stale_contents()
+        self.assertEqual(self.catalog.find("fileserver", search_contents=True), {"c-new.bat"})
+
+    def test_contents_of_removed_scripts_are_dropped(self):
+        self.catalog.set_index_contents(True)
+        file_names = self.catalog.take_stale_contents()
+        contents = {file_name: self.catalog.read_contents(file_name) for file_name in file_names}
+        self.catalog.update(self.folder, ["a-copy.bat"])  # Removed while the heads were read
+        self.catalog.set_contents(contents)
+        self.assertEqual(set(self.catalog.contents), {"a-copy.bat"})
+
+    def test_turning_the_index_off_drops_the_contents(self):
+        self.catalog.set_index_contents(True)
+        self.catalog.index_stale_contents()
+        self.catalog.set_index_contents(False)
+        self.assertEqual(self.catalog.find("fileserver", search_contents=True), set())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+"""ExecutionEngine running small .sh scripts: output capture, queueing and cancelling, so it needs a POSIX shell."""
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import script_runner  # noqa: E402
+
+TIMEOUT = 10
+
+
+def is_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    # An orphan nobody reaped yet is a zombie, it is not running anymore
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except OSError:
+        return True
+
+
+@unittest.skipUnless(os.name == "posix" and shutil.which("sh"), "needs sh and process groups")
+class ExecutionEngineTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.folder = self.temp_dir.name
+        self.engine = script_runner.ExecutionEngine(max_concurrent=1)
+        self.addCleanup(self.engine.cancel_all)
+
+    def make_script(self, name, body):
+        path = os.path.join(self.folder, name)
+        with open(path, "w") as f:
+            f.write(body + "\n")
+        return path
+
+    def wait_for(self, condition):
+        deadline = time.time() + TIMEOUT
+        while not condition():
+            self.assertLess(time.time(), deadline, "timed out")
+            time.sleep(0.02)
+
+    def get_output(self, run):
+        events = []
+        while not self.engine.events.empty():
+            events.append(self.engine.events.get_nowait())
+        return [event[2] for event in events if event[0] == "output" and event[1] is run]
+
+    def test_output_is_captured_in_whole_lines(self):
+        # The second line is written in two parts and the last one has no newline
+        path = self.make_script("a.sh", 'echo one\nprintf "tw"\nsleep 0.2\nprintf "o\\nthree"')
+        run = self.engine.submit(path)
+        self.assertTrue(run.done.wait(TIMEOUT))
+        self.assertEqual(run.state, "succeeded")
+        output = self.get_output(run)
+        self.assertTrue(all(text.endswith("\n") for text in output))
+        self.assertEqual("".join(output).splitlines(), ["one", "two", "three"])
+        self.assertEqual(run.output_size, len("one\ntwo\nthree"))
+
+    def test_exit_code(self):
+        run = self.engine.submit(self.make_script("a.sh", "exit 3"))
+        self.assertTrue(run.done.wait(TIMEOUT))
+        self.assertEqual((run.state, run.exit_code), ("failed", 3))
+
+    def test_runs_beyond_max_concurrent_are_queued(self):
+        first = self.engine.submit(self.make_script("a.sh", "while [ ! -e release ]; do sleep 0.05; done"))
+        second = self.engine.submit(self.make_script("b.sh", "exit 0"))
+        self.assertEqual(self.engine.get_counts(), (1, 1))
+        self.assertEqual((first.state, second.state), ("running", "queued"))
+        open(os.path.join(self.folder, "release"), "w").close()
+        self.assertTrue(second.done.wait(TIMEOUT))
+        self.assertEqual((first.state, second.state), ("succeeded", "succeeded"))
+        self.assertEqual(self.engine.get_counts(), (0, 0))
+
+    def test_cancel_queued_run(self):
+        self.engine.submit(self.make_script("a.sh", "sleep 30"))
+        finished = []
+        second = self.engine.submit(self.make_script("b.sh", "touch ran"), callback=finished.append)
+        self.engine.cancel(second)
+        self.assertTrue(second.done.is_set())
+        self.assertEqual(second.state, "cancelled")
+        self.assertEqual(finished, [second])
+        self.assertEqual(self.engine.get_counts(), (1, 0))
+        self.assertFalse(os.path.exists(os.path.join(self.folder, "ran")))
+
+    def test_cancel_stops_the_process_group(self):
+        # The script waits on a child of its own, which must be stopped with it
+        run = self.engine.submit(self.make_script("a.sh", "sleep 30 &\necho $! > child.pid\nwait"))
+        pid_path = os.path.join(self.folder, "child.pid")
+        self.wait_for(lambda: os.path.exists(pid_path) and os.path.getsize(pid_path))
+        with open(pid_path) as f:
+            child_pid = int(f.read())
+        self.engine.cancel(run)
+        self.assertTrue(run.done.wait(TIMEOUT))
+        self.assertEqual(run.state, "failed")
+        self.wait_for(lambda: not is_alive(child_pid))
+
+    def test_python_scripts_run_with_this_interpreter(self):
+        path = self.make_script("a.py", "import sys\nprint(sys.executable)")
+        self.assertEqual(script_runner.get_script_command(path), [sys.executable, path])
+        run = self.engine.submit(path)
+        self.assertTrue(run.done.wait(TIMEOUT))
+        self.assertEqual("".join(self.get_output(run)).strip(), sys.executable)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+"""FolderWatcher polling a temporary folder, the fallback used where inotify is not available."""
+import os
+import queue
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import script_runner  # noqa: E402
+
+TIMEOUT = 10
+
+
+class PollingWatcherTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.folder = self.temp_dir.name
+        self.write("a-one.bat", "@echo off\n")
+        self.events = queue.Queue()
+        self.watcher = script_runner.FolderWatcher(script_runner.ScriptRoot(self.folder, main=True), self.events, poll_interval=0.01)
+        thread = threading.Thread(target=self.watcher.poll, daemon=True)
+        thread.start()
+        self.addCleanup(thread.join, TIMEOUT)
+        self.addCleanup(self.watcher.stop)
+        time.sleep(0.05)  # The first listing is the baseline
+
+    def write(self, name, text):
+        with open(os.path.join(self.folder, name), "w") as f:
+            f.write(text)
+
+    def get_event(self):
+        return self.events.get(timeout=TIMEOUT)
+
+    def test_added_renamed_and_removed(self):
+        self.write("a-two.bat", "")
+        self.assertEqual(self.get_event(), ("added", "a-two.bat"))
+        os.rename(os.path.join(self.folder, "a-two.bat"), os.path.join(self.folder, "a-three.bat"))
+        self.assertEqual(self.get_event(), ("renamed", "a-two.bat", "a-three.bat"))
+        os.remove(os.path.join(self.folder, "a-three.bat"))
+        self.assertEqual(self.get_event(), ("removed", "a-three.bat"))
+
+    def test_edit_is_reported_although_the_folder_mtime_is_unchanged(self):
+        folder_mtime = os.stat(self.folder).st_mtime_ns
+        self.write("a-one.bat", "@echo off\necho edited\n")
+        os.utime(self.folder, ns=(folder_mtime, folder_mtime))
+        self.assertEqual(self.get_event(), ("modified", "a-one.bat"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+"""add_frecency scores and the frecency ordering of ScriptCatalog.search."""
+import math
+import os
+import sys
+import unittest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import script_runner  # noqa: E402
+
+NOW = 1_800_000_000.0
+HALF_LIFE = script_runner.FRECENCY_HALF_LIFE
+
+
+def score_runs(times):
+    score = None
+    for run_time in times:
+        score = script_runner.add_frecency(score, run_time)
+    return score
+
+
+class AddFrecencyTest(unittest.TestCase):
+    def test_two_runs_count_twice(self):
+        self.assertAlmostEqual(score_runs([NOW, NOW]), score_runs([NOW]) + math.log(2))
+
+    def test_a_run_counts_half_after_the_half_life(self):
+        self.assertAlmostEqual(score_runs([NOW - HALF_LIFE, NOW - HALF_LIFE]), score_runs([NOW]))
+
+    def test_recent_run_beats_older_run(self):
+        self.assertGreater(score_runs([NOW]), score_runs([NOW - 60]))
+
+    def test_frequent_old_runs_beat_one_recent_run(self):
+        self.assertGreater(score_runs([NOW - HALF_LIFE] * 3), score_runs([NOW]))
+
+    def test_order_of_runs_does_not_matter(self):
+        times = [NOW - 5 * HALF_LIFE, NOW, NOW - HALF_LIFE / 2]
+        self.assertAlmostEqual(score_runs(times), score_runs(reversed(times)))
+
+    def test_many_runs_do_not_overflow(self):
+        # The raw sum would be 2 ** (NOW / HALF_LIFE) per run, far beyond a float
+        score = score_runs([NOW] * 10000)
+        self.assertTrue(math.isfinite(score))
+        self.assertAlmostEqual(score, score_runs([NOW]) + math.log(10000), places=6)
+
+
+class FrecencySearchTest(unittest.TestCase):
+    def test_used_scripts_rank_first_within_name_matches(self):
+        catalog = script_runner.ScriptCatalog()
+        catalog.update("/scripts", ["docker-build.bat", "docker-clean.bat", "docker-deploy.bat", "wifi-docker-notes.bat"])
+        scores = {"docker-deploy.bat": score_runs([NOW]), "docker-clean.bat": score_runs([NOW - HALF_LIFE])}
+        ranked = catalog.search("docker", limit=3, scores=scores)
+        self.assertEqual(ranked, ["docker-deploy.bat", "docker-clean.bat", "docker-build.bat"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+"""RunScheduler driving a real ExecutionEngine with small .sh scripts, so it needs a POSIX shell."""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import script_runner  # noqa: E402
+
+TIMEOUT = 10
+
+
+@unittest.skipUnless(shutil.which("sh"), "needs sh to run the stub scripts")
+class RunSchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.folder = self.temp_dir.name
+        self.log_path = os.path.join(self.folder, "order.log")
+
+    def make_script(self, name, exit_code=0, body=""):
+        # Each script appends its name to order.log, so the tests can check what ran and when
+        path = os.path.join(self.folder, name)
+        with open(path, "w") as f:
+            f.write(f"{body}\necho {name} >> order.log\nexit {exit_code}\n")
+        return path
+
+    def read_order(self):
+        if not os.path.exists(self.log_path):
+            return []
+        with open(self.log_path) as f:
+            return f.read().split()
+
+    def run_batch(self, scripts, dependencies, stop_on_failure=True, max_concurrent=4):
+        engine = script_runner.ExecutionEngine(max_concurrent=max_concurrent)
+        scheduler = script_runner.RunScheduler(engine, "test", scripts, dependencies, stop_on_failure)
+        scheduler.start()
+        self.assertTrue(scheduler.done.wait(TIMEOUT), "the batch did not finish")
+        return scheduler
+
+    def test_dependencies_run_in_order(self):
+        scripts = {name: self.make_script(name) for name in ("a.sh", "b.sh", "c.sh")}
+        scheduler = self.run_batch(scripts, {"c.sh": ["b.sh"], "b.sh": ["a.sh"]})
+        self.assertEqual(self.read_order(), ["a.sh", "b.sh", "c.sh"])
+        self.assertEqual(set(scheduler.results.values()), {"succeeded"})
+
+    def test_independent_scripts_run_in_parallel(self):
+        # Each waits for the other to have started, which only finishes if both run at once
+        wait_for = 'touch {0}.started; for i in $(seq 50); do [ -e {1}.started ] && break; sleep 0.1; done; [ -e {1}.started ] || exit 1'
+        scripts = {
+            "a.sh": self.make_script("a.sh", body=wait_for.format("a", "b")),
+            "b.sh": self.make_script("b.sh", body=wait_for.format("b", "a")),
+        }
+        scheduler = self.run_batch(scripts, {}, max_concurrent=2)
+        self.assertEqual(scheduler.results, {"a.sh": "succeeded", "b.sh": "succeeded"})
+
+    def test_failure_skips_dependents_transitively(self):
+        scripts = {
+            "a.sh": self.make_script("a.sh", exit_code=1),
+            "b.sh": self.make_script("b.sh"),
+            "c.sh": self.make_script("c.sh"),
+            "d.sh": self.make_script("d.sh"),
+        }
+        scheduler = self.run_batch(scripts, {"b.sh": ["a.sh"], "c.sh": ["b.sh"]}, stop_on_failure=False)
+        self.assertEqual(scheduler.results, {"a.sh": "failed", "b.sh": "skipped", "c.sh": "skipped", "d.sh": "succeeded"})
+        self.assertNotIn("b.sh", self.read_order())
+        self.assertNotIn("c.sh", self.read_order())
+
+    def test_stop_on_failure_cancels_queued_runs(self):
+        scripts = {
+            "a.sh": self.make_script("a.sh", exit_code=1),
+            "b.sh": self.make_script("b.sh"),
+            "c.sh": self.make_script("c.sh"),
+        }
+        # One slot, so b and c are still queued in the engine when a fails
+        scheduler = self.run_batch(scripts, {}, max_concurrent=1)
+        self.assertEqual(scheduler.results["a.sh"], "failed")
+        # Cancelled in the engine queue, or skipped if a failed before they were even submitted
+        self.assertLessEqual({scheduler.results["b.sh"], scheduler.results["c.sh"]}, {"cancelled", "skipped"})
+        self.assertEqual(self.read_order(), ["a.sh"])
+        self.assertIn("1 failed, 2 skipped", scheduler.get_summary())
+
+    def test_dependencies_outside_the_batch_are_ignored(self):
+        scripts = {"b.sh": self.make_script("b.sh")}
+        scheduler = self.run_batch(scripts, {"b.sh": ["a.sh", "b.sh"]})
+        self.assertEqual(scheduler.results, {"b.sh": "succeeded"})
+
+    def test_cycle_is_rejected(self):
+        scripts = {name: self.make_script(name) for name in ("a.sh", "b.sh", "c.sh")}
+        engine = script_runner.ExecutionEngine()
+        with self.assertRaisesRegex(ValueError, "a.sh, b.sh"):
+            script_runner.RunScheduler(engine, "test", scripts, {"a.sh": ["b.sh"], "b.sh": ["a.sh"], "c.sh": ["a.sh"]})
+
+
+class FailingEngine(script_runner.ExecutionEngine):
+    # Every run fails inside submit, before the scheduler gets to submit the next script
+    def start(self, run):
+        self.finish(run, 1)
+
+
+class StopOnFailureRaceTest(unittest.TestCase):
+    def test_scripts_after_a_failure_in_the_same_pass_are_skipped(self):
+        scripts = {name: os.path.join(tempfile.gettempdir(), name) for name in ("a.sh", "b.sh", "c.sh")}
+        scheduler = script_runner.RunScheduler(FailingEngine(max_concurrent=4), "test", scripts, {})
+        scheduler.start()
+        self.assertTrue(scheduler.done.is_set())
+        self.assertEqual(scheduler.results, {"a.sh": "failed", "b.sh": "skipped", "c.sh": "skipped"})
+
+
+class FailDuringSubmitEngine(script_runner.ExecutionEngine):
+    # Nothing starts on its own. While b.sh is being submitted, the queued a.sh fails, as if its
+    # process had exited on another thread between submit and the scheduler storing the run.
+    def __init__(self):
+        super().__init__(max_concurrent=0)
+
+    def submit(self, file_path, console=False, callback=None):
+        run = super().submit(file_path, console, callback)
+        if run.name == "b.sh":
+            first_run = self.pending.popleft()
+            self.finish(first_run, 1)
+        return run
+
+
+class StopOnFailureDuringSubmitTest(unittest.TestCase):
+    def test_run_submitted_while_the_batch_stopped_is_cancelled(self):
+        scripts = {name: os.path.join(tempfile.gettempdir(), name) for name in ("a.sh", "b.sh")}
+        engine = FailDuringSubmitEngine()
+        scheduler = script_runner.RunScheduler(engine, "test", scripts, {})
+        scheduler.start()
+        self.assertTrue(scheduler.done.is_set())
+        self.assertEqual(scheduler.results, {"a.sh": "failed", "b.sh": "cancelled"})
+        self.assertFalse(engine.pending)
+
+
+class ScriptDependenciesTest(unittest.TestCase):
+    def test_header_comments_and_section_manifest(self):
+        with tempfile.TemporaryDirectory() as folder:
+            scripts = {}
+            for name, text in (("p-init.bat", "@echo off\n"),
+                               ("p-copy.bat", "@echo off\nREM depends: p-init\n"),
+                               ("p-run.bat", ":: after: p-copy.bat\n"),
+                               ("p-report.bat", "@echo off\n")):
+                scripts[name] = os.path.join(folder, name)
+                with open(scripts[name], "w") as f:
+                    f.write(text)
+            with open(os.path.join(folder, script_runner.SECTION_MANIFEST_FILE), "w") as f:
+                f.write("[p]\norder = p-run.bat, p-report.bat\n")
+
+            dependencies = script_runner.get_script_dependencies(folder, scripts, script_runner.PreviewCache())
+            self.assertEqual(dependencies, {"p-init.bat": [], "p-copy.bat": ["p-init.bat"],
+                                            "p-run.bat": ["p-copy.bat"], "p-report.bat": ["p-run.bat"]})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+"""ScriptRoot and ScriptRoots on temporary folders: keys, globs, sections and scanning."""
+import configparser
+import os
+import sys
+import tempfile
+import unittest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import script_runner  # noqa: E402
+
+
+def make_files(folder, relative_paths):
+    for relative_path in relative_paths:
+        path = os.path.join(folder, *relative_path.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write("@echo off\n")
+
+
+class ScriptRootScanTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.folder = self.temp_dir.name
+        make_files(self.folder, ["a-one.bat", "a-two.lnk", "notes.txt", "docker/build.bat", "docker/old/clean.bat", "tmp/scratch.bat"])
+
+    def scan(self, **options):
+        return sorted(script_runner.ScriptRoot(self.folder, main=True, **options).scan())
+
+    def test_flat_scan_lists_scripts_of_the_folder_only(self):
+        self.assertEqual(self.scan(), ["a-one.bat", "a-two.lnk"])
+
+    def test_recursive_scan_lists_subfolders(self):
+        expected = ["a-one.bat", "a-two.lnk", os.path.join("docker", "build.bat"),
+                    os.path.join("docker", "old", "clean.bat"), os.path.join("tmp", "scratch.bat")]
+        self.assertEqual(self.scan(recursive=True), expected)
+
+    def test_include_and_exclude_globs(self):
+        files = self.scan(recursive=True, include=["docker/*", "a-*"], exclude=["docker/old", "*.lnk"])
+        self.assertEqual(files, ["a-one.bat", os.path.join("docker", "build.bat")])
+
+    def test_excluded_folder_is_not_listed(self):
+        self.assertEqual(self.scan(recursive=True, exclude=["tmp"]),
+                         ["a-one.bat", "a-two.lnk", os.path.join("docker", "build.bat"), os.path.join("docker", "old", "clean.bat")])
+
+    def test_scan_state_is_mtime_and_size(self):
+        files = script_runner.ScriptRoot(self.folder, main=True).scan(inodes=True)
+        stat = os.stat(os.path.join(self.folder, "a-one.bat"))
+        self.assertEqual(files["a-one.bat"], [stat.st_mtime_ns, stat.st_size, stat.st_ino])
+
+    @unittest.skipIf(os.name == "nt", "creating symlinks needs a privilege on Windows")
+    def test_script_that_cannot_be_stat_is_skipped(self):
+        # A dangling link is listed by scandir but its stat fails, like a file deleted mid-scan
+        os.symlink(os.path.join(self.folder, "missing.bat"), os.path.join(self.folder, "a-dangling.bat"))
+        self.assertEqual(self.scan(), ["a-one.bat", "a-two.lnk"])
+
+    def test_subfolder_sections(self):
+        root = script_runner.ScriptRoot(self.folder, recursive=True, subfolder_sections=True, main=True)
+        self.assertEqual(root.get_section(os.path.join("docker", "old", "clean.bat")), "docker/old")
+        self.assertEqual(root.get_section("a-one.bat"), "a")
+        flat = script_runner.ScriptRoot(self.folder, recursive=True, main=True)
+        self.assertEqual(flat.get_section(os.path.join("docker", "build.bat")), "#no_section")
+
+
+class ScriptRootsTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.main_folder = os.path.join(self.temp_dir.name, "scripts")
+        self.tools_folder = os.path.join(self.temp_dir.name, "tools")
+        self.nested_folder = os.path.join(self.tools_folder, "nested")
+        make_files(self.main_folder, ["m-main.bat"])
+        make_files(self.tools_folder, ["t-tool.bat", "t-tool-old.bat"])
+        make_files(self.nested_folder, ["n-nested.bat"])
+        config = configparser.ConfigParser()
+        config.read_string(f"[Settings]\n\n[Root tools]\npath = {self.tools_folder}\nexclude = *-old.bat\n"
+                           f"\n[Root nested]\npath = {self.nested_folder}\n")
+        self.roots = script_runner.ScriptRoots.from_config(config, self.main_folder)
+
+    def test_get_root(self):
+        main, tools, nested = self.roots.roots
+        self.assertIs(self.roots.get_root("m-main.bat"), main)
+        self.assertIs(self.roots.get_root(os.path.join(self.tools_folder, "t-tool.bat")), tools)
+        # The most specific root wins for a root inside another
+        self.assertIs(self.roots.get_root(os.path.join(self.nested_folder, "n-nested.bat")), nested)
+
+    def test_get_key(self):
+        self.assertEqual(self.roots.get_key(os.path.join(self.main_folder, "m-main.bat")), "m-main.bat")
+        tool_path = os.path.join(self.tools_folder, "t-tool.bat")
+        self.assertEqual(self.roots.get_key(tool_path), tool_path)
+
+    def test_accepts(self):
+        self.assertTrue(self.roots.accepts("m-new.bat"))
+        self.assertFalse(self.roots.accepts("m-new.txt"))
+        self.assertTrue(self.roots.accepts(os.path.join(self.tools_folder, "t-new.bat")))
+        self.assertFalse(self.roots.accepts(os.path.join(self.tools_folder, "t-new-old.bat")))
+
+    def test_scan_keys_main_scripts_by_relative_path_and_others_by_full_path(self):
+        expected = {"m-main.bat", os.path.join(self.tools_folder, "t-tool.bat"), os.path.join(self.nested_folder, "n-nested.bat")}
+        self.assertEqual(set(self.roots.scan()), expected)
+
+    def test_unreadable_extra_root_is_skipped(self):
+        self.roots.roots.append(script_runner.ScriptRoot(os.path.join(self.temp_dir.name, "missing")))
+        self.assertIn("m-main.bat", self.roots.scan())
+
+
+if __name__ == "__main__":
+    unittest.main()
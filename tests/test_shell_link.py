@@ -0,0 +1,148 @@
+"""parse_shell_link on .lnk files built byte by byte, so no Windows shell is needed."""
+import os
+import struct
+import sys
+import tempfile
+import unittest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import script_runner  # noqa: E402
+
+LINK_CLSID = b"\x01\x14\x02\x00\x00\x00\x00\x00\xc0\x00\x00\x00\x00\x00\x00\x46"
+HAS_ID_LIST = 0x01
+HAS_LINK_INFO = 0x02
+HAS_RELATIVE_PATH = 0x08
+IS_UNICODE = 0x80
+HAS_EXP_STRING = 0x200
+VOLUME_ID = struct.pack("<4I", 0x11, 3, 0, 0x10) + b"\0"
+
+
+def make_link(link_flags, link_info=b"", relative_path=None, extra_data=b""):
+    data = struct.pack("<I16sIIQQQIIIHHII", 0x4C, LINK_CLSID, link_flags, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0)
+    if link_flags & HAS_ID_LIST:
+        data += struct.pack("<H", 2) + b"\0\0"  # An empty item ID list
+    data += link_info
+    if relative_path is not None:
+        data += struct.pack("<H", len(relative_path))
+        data += relative_path.encode("utf-16-le" if link_flags & IS_UNICODE else "ascii")
+    return data + extra_data + struct.pack("<I", 0)  # Terminal block
+
+
+def make_local_link_info(path, unicode=False):
+    # VolumeIDAndLocalBasePath, the Unicode variant also carries the path as UTF-16
+    header_size = 0x24 if unicode else 0x1C
+    local_base_path = b"?\0" if unicode else path.encode("ascii") + b"\0"
+    local_base_path_offset = header_size + len(VOLUME_ID)
+    suffix_offset = local_base_path_offset + len(local_base_path)
+    body = VOLUME_ID + local_base_path + b"\0"
+    offsets = [header_size, local_base_path_offset, 0, suffix_offset]
+    if unicode:
+        offsets += [header_size + len(body), header_size + len(body) + 2 * len(path) + 2]
+        body += path.encode("utf-16-le") + b"\0\0" + b"\0\0"
+    return struct.pack(f"<{3 + len(offsets)}I", header_size + len(body), header_size, 0x01, *offsets) + body
+
+
+def make_network_link_info(net_name, suffix, unicode=False):
+    header_size = 0x1C
+    network_offset = header_size
+    if unicode:
+        net_name_offset = 0x1C
+        network = struct.pack("<5I", 0, 0x02, net_name_offset, 0, 0x20000)
+        ansi_name = b"?\0"
+        network += struct.pack("<2I", net_name_offset + len(ansi_name), 0) + ansi_name + net_name.encode("utf-16-le") + b"\0\0"
+    else:
+        net_name_offset = 0x14
+        network = struct.pack("<5I", 0, 0x02, net_name_offset, 0, 0x20000) + net_name.encode("ascii") + b"\0"
+    network = struct.pack("<I", len(network)) + network[4:]
+    suffix_offset = network_offset + len(network)
+    body = network + suffix.encode("ascii") + b"\0"
+    return struct.pack("<7I", header_size + len(body), header_size, 0x02, 0, 0, network_offset, suffix_offset) + body
+
+
+def make_environment_block(target, ansi_target=""):
+    return (struct.pack("<2I", 0x314, 0xA0000001)
+            + ansi_target.encode("ascii").ljust(260, b"\0")
+            + target.encode("utf-16-le").ljust(520, b"\0"))
+
+
+class ParseShellLinkTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+    def parse(self, data):
+        lnk_path = os.path.join(self.temp_dir.name, "shortcut.lnk")
+        with open(lnk_path, "wb") as f:
+            f.write(data)
+        return script_runner.parse_shell_link(lnk_path)
+
+    def test_local_path(self):
+        link_info = make_local_link_info(r"C:\scripts\project_1-initialize-docker.bat")
+        self.assertEqual(self.parse(make_link(HAS_LINK_INFO, link_info)), r"C:\scripts\project_1-initialize-docker.bat")
+
+    def test_local_path_after_id_list(self):
+        link_info = make_local_link_info(r"C:\scripts\a.bat")
+        self.assertEqual(self.parse(make_link(HAS_ID_LIST | HAS_LINK_INFO, link_info)), r"C:\scripts\a.bat")
+
+    def test_unicode_local_path(self):
+        path = "C:\\Skripte\\prüfung-ώρα-启动.bat"
+        link_info = make_local_link_info(path, unicode=True)
+        self.assertEqual(self.parse(make_link(HAS_LINK_INFO | IS_UNICODE, link_info)), path)
+
+    def test_network_path(self):
+        link_info = make_network_link_info(r"\\fileserver\team_a", r"deploy\run.bat")
+        self.assertEqual(self.parse(make_link(HAS_LINK_INFO, link_info)), r"\\fileserver\team_a\deploy\run.bat")
+
+    def test_unicode_network_name(self):
+        link_info = make_network_link_info("\\\\serveur\\équipe", r"run.bat", unicode=True)
+        self.assertEqual(self.parse(make_link(HAS_LINK_INFO, link_info)), "\\\\serveur\\équipe\\run.bat")
+
+    def test_network_share_without_suffix(self):
+        link_info = make_network_link_info(r"\\fileserver\team_a", "")
+        self.assertEqual(self.parse(make_link(HAS_LINK_INFO, link_info)), r"\\fileserver\team_a")
+
+    def test_environment_target(self):
+        os.environ["SCRIPT_RUNNER_TEST_DIR"] = "/opt/scripts"
+        self.addCleanup(os.environ.pop, "SCRIPT_RUNNER_TEST_DIR")
+        variable = "%SCRIPT_RUNNER_TEST_DIR%" if os.name == "nt" else "$SCRIPT_RUNNER_TEST_DIR"
+        data = make_link(HAS_ID_LIST | HAS_EXP_STRING, extra_data=make_environment_block(variable + "/a.bat"))
+        self.assertEqual(self.parse(data), "/opt/scripts/a.bat")
+
+    def test_environment_target_ansi_only(self):
+        data = make_link(HAS_EXP_STRING, extra_data=make_environment_block("", ansi_target=r"C:\scripts\a.bat"))
+        self.assertEqual(self.parse(data), r"C:\scripts\a.bat")
+
+    def test_relative_path(self):
+        data = make_link(HAS_ID_LIST | HAS_RELATIVE_PATH | IS_UNICODE, relative_path=os.path.join("..", "targets", "a.bat"))
+        expected = os.path.normpath(os.path.join(self.temp_dir.name, "..", "targets", "a.bat"))
+        self.assertEqual(self.parse(data), expected)
+
+    def test_id_list_only_needs_the_shell(self):
+        self.assertIsNone(self.parse(make_link(HAS_ID_LIST)))
+
+    def test_not_a_shell_link(self):
+        with self.assertRaises(ValueError):
+            self.parse(b"@echo off\r\n" * 10)
+
+
+class ShortcutResolverTest(unittest.TestCase):
+    def test_resolves_and_caches_by_mtime_and_size(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            lnk_path = os.path.join(temp_dir, "shortcut.lnk")
+            with open(lnk_path, "wb") as f:
+                f.write(make_link(HAS_LINK_INFO, make_local_link_info(r"C:\scripts\a.bat")))
+            cache_path = os.path.join(temp_dir, "cache.json")
+            resolver = script_runner.ShortcutResolver(cache_path)
+            self.assertEqual(resolver.resolve(lnk_path), r"C:\scripts\a.bat")
+            resolver.save()
+
+            with open(lnk_path, "wb") as f:
+                f.write(make_link(HAS_LINK_INFO, make_local_link_info(r"C:\scripts\bb.bat")))
+            reloaded = script_runner.ShortcutResolver(cache_path)
+            self.assertEqual(reloaded.resolve(lnk_path), r"C:\scripts\bb.bat")
+
+
+if __name__ == "__main__":
+    unittest.main()